@@ -0,0 +1,111 @@
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from users.models import User
+
+CLAIM_FIELDS = ('username', 'role', 'is_staff', 'is_superuser')
+TOKEN_VERSION_CLAIM = 'ver'
+
+
+def get_token_version_key(user_id):
+    return f'auth:token_version:{user_id}'
+
+
+def make_token_version(values):
+    """Отпечаток полей, от которых зависят права пользователя."""
+    return md5('|'.join(map(str, values)).encode()).hexdigest()[:16]
+
+
+def get_user_token_version(user):
+    return make_token_version(
+        [getattr(user, field) for field in CLAIM_FIELDS] + [user.is_active]
+    )
+
+
+def cache_token_version(user):
+    cache.set(
+        get_token_version_key(user.pk), get_user_token_version(user),
+        settings.AUTH_TOKEN_VERSION_TIMEOUT
+    )
+
+
+def get_token_version(user_id, use_cache=True):
+    """Текущая версия прав пользователя; при промахе кэша — из базы.
+
+    С `use_cache=False` версия всегда читается из базы и обновляется
+    в кэше. Для удалённого пользователя возвращается None.
+    """
+    key = get_token_version_key(user_id)
+    version = cache.get(key) if use_cache else None
+    if version is None:
+        values = User.objects.filter(pk=user_id).values_list(
+            *CLAIM_FIELDS, 'is_active'
+        ).first()
+        if values is None:
+            return None
+        version = make_token_version(values)
+        cache.set(key, version, settings.AUTH_TOKEN_VERSION_TIMEOUT)
+    return version
+
+
+def add_token_claims(token, user):
+    """Записывает в токен роль и флаги, нужные для проверки прав."""
+    for field in CLAIM_FIELDS:
+        token[field] = getattr(user, field)
+    token[TOKEN_VERSION_CLAIM] = get_user_token_version(user)
+    return token
+
+
+def get_claims_user(token):
+    """Пользователь, собранный из утверждений токена без запроса к базе.
+
+    Остальные поля отложены и подгружаются из базы при обращении.
+    """
+    values = {
+        'id': token[api_settings.USER_ID_CLAIM],
+        'is_active': True,
+        **{field: token[field] for field in CLAIM_FIELDS},
+    }
+    fields = [
+        field.attname for field in User._meta.concrete_fields
+        if field.attname in values
+    ]
+    return User.from_db(
+        DEFAULT_DB_ALIAS, fields, [values[field] for field in fields]
+    )
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """Аутентификация по JWT без загрузки пользователя из базы.
+
+    Если версия прав в токене совпадает с текущей, пользователь строится
+    из утверждений токена. Иначе роль могла измениться, и пользователь
+    загружается из базы целиком. Для изменяющих запросов версия читается
+    из базы, а не из кэша: права могли смениться в обход сигналов
+    (`QuerySet.update`, `load_catalog --sync`).
+    """
+
+    def authenticate(self, request):
+        self.use_cached_version = request.method in SAFE_METHODS
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Token contained no recognizable user identification'
+            )
+        version = validated_token.get(TOKEN_VERSION_CLAIM)
+        if version is not None and version == get_token_version(
+            user_id, getattr(self, 'use_cached_version', True)
+        ):
+            return get_claims_user(validated_token)
+        return super().get_user(validated_token)
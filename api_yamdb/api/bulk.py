@@ -0,0 +1,105 @@
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from api.cache import bump_catalog_version
+from api.serializers import BulkReviewSerializer
+from api.validators import REVIEW_EXISTS_MESSAGE
+from reviews.models import Review, Title
+from users.models import User
+
+BULK_REVIEWS_CHUNK_SIZE = 500
+
+
+class ReviewBatch:
+    """Пачка отзывов к разным произведениям.
+
+    Произведения, авторы и существующие пары (произведение, автор)
+    проверяются тремя запросами на всю пачку, отзывы вставляются через
+    `bulk_create` порциями, рейтинг пересчитывается один раз на каждое
+    затронутое произведение.
+    """
+
+    def __init__(self, items, chunk_size=BULK_REVIEWS_CHUNK_SIZE):
+        self.items = items
+        self.chunk_size = chunk_size
+        self.results = [None] * len(items)
+        self.valid = {}
+        self.reviews = {}
+
+    def add_error(self, index, errors):
+        self.results[index] = {'status': 'error', 'errors': errors}
+
+    def validate_items(self):
+        for index, item in enumerate(self.items):
+            serializer = BulkReviewSerializer(data=item)
+            if serializer.is_valid():
+                self.valid[index] = serializer.validated_data
+            else:
+                self.add_error(index, serializer.errors)
+
+    def resolve(self):
+        title_ids = set(Title.objects.filter(
+            pk__in={data['title'] for data in self.valid.values()}
+        ).values_list('pk', flat=True))
+        authors = dict(User.objects.filter(
+            username__in={data['author'] for data in self.valid.values()}
+        ).values_list('username', 'pk'))
+        taken = set(Review.objects.filter(
+            title_id__in=title_ids, author_id__in=authors.values()
+        ).values_list('title_id', 'author_id'))
+        return title_ids, authors, taken
+
+    def build_reviews(self):
+        title_ids, authors, taken = self.resolve()
+        for index, data in self.valid.items():
+            errors = {}
+            if data['title'] not in title_ids:
+                errors['title'] = ['Произведение не найдено.']
+            if data['author'] not in authors:
+                errors['author'] = ['Пользователь не найден.']
+            pair = (data['title'], authors.get(data['author']))
+            if not errors and pair in taken:
+                errors['non_field_errors'] = [REVIEW_EXISTS_MESSAGE]
+            if errors:
+                self.add_error(index, errors)
+                continue
+            taken.add(pair)
+            self.reviews[index] = Review(
+                title_id=pair[0], author_id=pair[1],
+                text=data['text'], score=data['score']
+            )
+
+    def save(self):
+        reviews = self.reviews.values()
+        affected = {review.title_id for review in reviews}
+        try:
+            with transaction.atomic():
+                Review.objects.bulk_create(reviews, batch_size=self.chunk_size)
+                Title.objects.filter(pk__in=affected).refresh_ratings()
+        except IntegrityError:
+            raise serializers.ValidationError(
+                'Отзывы изменились во время загрузки, повторите запрос.'
+            )
+        created = {
+            (title_id, author_id): pk
+            for pk, title_id, author_id in Review.objects.filter(
+                title_id__in=affected,
+                author_id__in={review.author_id for review in reviews}
+            ).values_list('pk', 'title_id', 'author_id')
+        }
+        for index, review in self.reviews.items():
+            self.results[index] = {
+                'status': 'created',
+                'id': created[(review.title_id, review.author_id)]
+            }
+        bump_catalog_version('titles')
+        for title_id in affected:
+            bump_catalog_version(f'title:{title_id}')
+            bump_catalog_version(f'reviews:{title_id}')
+
+    def process(self):
+        self.validate_items()
+        self.build_reviews()
+        if self.reviews:
+            self.save()
+        return self.results
@@ -0,0 +1,115 @@
+import time
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+CACHED_RESOURCES = ('categories', 'genres', 'titles')
+
+
+def get_version_key(resource):
+    return f'catalog:version:{resource}'
+
+
+def get_catalog_version(resource):
+    """Текущая версия ресурса; при потере ключа начинается новая."""
+    return get_catalog_versions((resource,))[resource]
+
+
+def get_catalog_versions(resources):
+    keys = {get_version_key(resource): resource for resource in resources}
+    versions = cache.get_many(keys)
+    for key in keys.keys() - versions.keys():
+        cache.add(key, time.time_ns(), None)
+        versions[key] = cache.get(key)
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def bump_catalog_version(resource):
+    """Меняет версию ресурса после фиксации текущей транзакции.
+
+    Если сменить версию до COMMIT, параллельный GET прочитает старые
+    строки и закэширует их уже под новой версией.
+    """
+    transaction.on_commit(lambda: _bump_catalog_version(resource))
+
+
+def _bump_catalog_version(resource):
+    # Не incr: в файловом кэше это чтение и запись, и при параллельной
+    # смене из двух процессов одна из них терялась бы.
+    cache.set(get_version_key(resource), time.time_ns(), None)
+
+
+def get_catalog_cache_key(resource, request):
+    url = md5(request.build_absolute_uri().encode()).hexdigest()
+    return f'catalog:{resource}:{get_catalog_version(resource)}:{url}'
+
+
+def get_stats_key(resource, kind):
+    return f'catalog:stats:{resource}:{kind}'
+
+
+def record_cache_access(resource, hit):
+    """Увеличивает счётчик в общем кэше, чтобы он учитывал все процессы."""
+    key = get_stats_key(resource, 'hits' if hit else 'misses')
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def get_cache_stats(resources=CACHED_RESOURCES):
+    """Счётчики попаданий и промахов кэша каталога по ресурсам."""
+    keys = {
+        get_stats_key(resource, kind): (resource, kind)
+        for resource in resources for kind in ('hits', 'misses')
+    }
+    counters = cache.get_many(keys)
+    stats = {}
+    for key, (resource, kind) in keys.items():
+        stats.setdefault(resource, {})[kind] = counters.get(key, 0)
+    return stats
+
+
+def reset_cache_stats(resources=CACHED_RESOURCES):
+    cache.delete_many([
+        get_stats_key(resource, kind)
+        for resource in resources for kind in ('hits', 'misses')
+    ])
+
+
+class CatalogCacheMixin:
+    """Кэширует данные ответов на GET-запросы к каталогу.
+
+    Ключ включает полный адрес запроса и версию ресурса `cache_resource`,
+    которую сигналы увеличивают при изменении каталога.
+    """
+    cache_resource = None
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        key = get_catalog_cache_key(self.cache_resource, request)
+        data = cache.get(key)
+        record_cache_access(self.cache_resource, hit=data is not None)
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, settings.CATALOG_CACHE_TIMEOUT)
+        return response
+
+
+class CachedListMixin(CatalogCacheMixin):
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class CachedRetrieveMixin(CatalogCacheMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,70 @@
+import time
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from api.cache import get_catalog_versions
+
+
+class ConditionalGetMixin:
+    """Условные GET-запросы по слабому ETag и Last-Modified.
+
+    ETag и Last-Modified собираются из версий ресурсов
+    `get_version_resources()`, которые меняют сигналы, поэтому ответ 304
+    отдаётся без запроса списка и без сериализации.
+    """
+
+    def get_version_resources(self):
+        raise NotImplementedError
+
+    def get_last_modified(self, versions):
+        """Last-Modified по версиям ресурсов, в секундах.
+
+        Версия — это time_ns() последнего изменения, поэтому она меняется
+        и при правке, и при удалении. Заголовок точен до секунды, так что
+        берётся следующая целая секунда, и отдаётся он только после её
+        наступления: иначе изменение в ту же секунду не сдвинуло бы
+        Last-Modified и клиент получил бы 304 для устаревших данных.
+        """
+        last_modified = max(versions.values()) // 10 ** 9 + 1
+        if last_modified > time.time():
+            return None
+        return last_modified
+
+    def get_etag(self, versions):
+        stamp = '-'.join(
+            f'{resource}.{version}'
+            for resource, version in sorted(versions.items())
+        )
+        return f'W/"{stamp}"'
+
+    def get_conditional_get_response(self, handler, request, *args,
+                                     **kwargs):
+        versions = get_catalog_versions(self.get_version_resources())
+        etag = self.get_etag(versions)
+        last_modified = self.get_last_modified(versions)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class ConditionalListMixin(ConditionalGetMixin):
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_get_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class ConditionalRetrieveMixin(ConditionalGetMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_get_response(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -1,6 +1,8 @@
 from django_filters.rest_framework import CharFilter, FilterSet
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
 
 from reviews.models import Title
+from reviews.search import search_titles, to_fts_query
 
 
 class FilterTitle(FilterSet):
@@ -11,3 +13,41 @@ class FilterTitle(FilterSet):
     class Meta:
         model = Title
         fields = ('year', 'category', 'genre', 'name')
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    """Полнотекстовый поиск произведений по `?q=` с ранжированием.
+
+    Параметр `?search=` обрабатывается так же для старых клиентов.
+    """
+    search_params = ('q', 'search')
+
+    def filter_queryset(self, request, queryset, view):
+        for param in self.search_params:
+            if param in request.query_params:
+                return search_titles(queryset, request.query_params[param])
+        return queryset
+
+    def get_ranked_param(self, request):
+        """Параметр поиска, который упорядочит список по релевантности."""
+        for param in self.search_params:
+            if param in request.query_params:
+                if to_fts_query(request.query_params[param]):
+                    return param
+                return None
+        return None
+
+
+class StableOrderingFilter(OrderingFilter):
+    """Дополняет сортировку полем id, чтобы порядок был однозначным.
+
+    Направление id для каждого поля берётся из `ordering_tiebreakers`
+    вьюсета так, чтобы сортировка совпадала с составным индексом.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering or ordering[-1].lstrip('-') in ('id', 'pk'):
+            return ordering
+        tiebreakers = getattr(view, 'ordering_tiebreakers', {})
+        return (*ordering, tiebreakers.get(ordering[0], 'id'))
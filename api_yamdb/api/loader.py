@@ -0,0 +1,643 @@
+import csv
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from hashlib import md5
+from itertools import islice
+from timeit import default_timer
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils.dateparse import parse_datetime
+
+from reviews.models import (
+    Category, Comment, Genre, ImportedRow, Review, Title
+)
+from users.models import User
+
+LOAD_BATCH_SIZE = 1000
+PROGRESS_INTERVAL = 5
+
+# Профиль быстрой загрузки SQLite: журнал WAL сохраняет откат пачек,
+# синхронизация с диском отключена, кэш страниц — 256 МБ.
+FAST_LOAD_PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'OFF'),
+    ('cache_size', -256 * 1024),
+    ('temp_store', 'MEMORY'),
+)
+
+
+class LoadError(Exception):
+    """Строка CSV или контрольная точка, с которой нельзя продолжить."""
+
+
+def to_int(value):
+    return int(value)
+
+
+def to_optional_int(value):
+    return int(value) if value else None
+
+
+def to_text(value):
+    return value
+
+
+def to_score(value):
+    score = int(value)
+    if not 1 <= score <= 10:
+        raise ValueError(f'оценка вне диапазона 1..10: {score}')
+    return score
+
+
+def to_datetime(value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f'некорректная дата: {value!r}')
+    return parsed
+
+
+class CsvTable:
+    """Описание CSV-файла из `static/data` и модели, в которую он грузится.
+
+    `columns` сопоставляет имя атрибута модели с колонкой CSV и функцией
+    приведения значения.
+    """
+
+    def __init__(self, name, filename, model, columns, defaults=None,
+                 parent=None):
+        self.name = name
+        self.filename = filename
+        self.model = model
+        self.columns = columns
+        self.defaults = defaults or {}
+        self.parent = parent
+
+    @property
+    def update_fields(self):
+        """Поля из CSV; значения по умолчанию задаются только при вставке."""
+        return [attname for attname in self.columns if attname != 'id']
+
+    def digest(self, values):
+        return md5(repr(
+            [values[attname] for attname in self.columns]
+        ).encode()).hexdigest()
+
+    def convert(self, row):
+        values = dict(self.defaults)
+        for attname, (column, convert) in self.columns.items():
+            values[attname] = convert(row[column])
+        return values
+
+    def build(self, values):
+        return self.model(**values)
+
+
+TABLES = (
+    CsvTable('users', 'users.csv', User, {
+        'id': ('id', to_int),
+        'username': ('username', to_text),
+        'email': ('email', to_text),
+        'role': ('role', to_text),
+        'bio': ('bio', to_text),
+        'first_name': ('first_name', to_text),
+        'last_name': ('last_name', to_text),
+    }, defaults={'password': make_password(None)}),
+    CsvTable('category', 'category.csv', Category, {
+        'id': ('id', to_int),
+        'name': ('name', to_text),
+        'slug': ('slug', to_text),
+    }),
+    CsvTable('genre', 'genre.csv', Genre, {
+        'id': ('id', to_int),
+        'name': ('name', to_text),
+        'slug': ('slug', to_text),
+    }),
+    CsvTable('titles', 'titles.csv', Title, {
+        'id': ('id', to_int),
+        'name': ('name', to_text),
+        'year': ('year', to_int),
+        'category_id': ('category', to_optional_int),
+    }),
+    CsvTable('genre_title', 'genre_title.csv', Title.genre.through, {
+        'id': ('id', to_int),
+        'title_id': ('title_id', to_int),
+        'genre_id': ('genre_id', to_int),
+    }, parent='title_id'),
+    CsvTable('review', 'review.csv', Review, {
+        'id': ('id', to_int),
+        'title_id': ('title_id', to_int),
+        'text': ('text', to_text),
+        'author_id': ('author', to_int),
+        'score': ('score', to_score),
+        'pub_date': ('pub_date', to_datetime),
+    }, parent='title_id'),
+    CsvTable('comments', 'comments.csv', Comment, {
+        'id': ('id', to_int),
+        'review_id': ('review_id', to_int),
+        'text': ('text', to_text),
+        'author_id': ('author', to_int),
+        'pub_date': ('pub_date', to_datetime),
+    }, parent='review_id'),
+)
+
+
+def get_table(name):
+    return next(table for table in TABLES if table.name == name)
+
+
+@contextmanager
+def keep_auto_now(model):
+    """Даты из CSV не должны заменяться текущим временем при вставке."""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def read_header(csv_file):
+    return next(csv.reader([csv_file.readline().decode('utf-8-sig')]))
+
+
+def parse_records(lines, position):
+    """Записи CSV из строк в байтах со смещением после каждой записи."""
+    def decoded():
+        nonlocal position
+        for line in lines:
+            position += len(line)
+            yield line.decode('utf-8')
+
+    for record in csv.reader(decoded()):
+        if record:
+            yield record, position
+
+
+def read_chunks(path, offset=0, size=LOAD_BATCH_SIZE):
+    """Строки CSV в байтах, сгруппированные по `size` целых записей.
+
+    Разбор CSV здесь не нужен: запись закончена, когда число кавычек
+    с её начала чётное (экранированная кавычка удваивается).
+    """
+    with open(path, 'rb') as csv_file:
+        header = read_header(csv_file)
+        position = max(offset, csv_file.tell())
+        csv_file.seek(position)
+        lines, records, quoted = [], 0, False
+        for line in csv_file:
+            lines.append(line)
+            quoted ^= line.count(b'"') % 2 == 1
+            if not quoted:
+                records += 1
+                if records == size:
+                    yield header, position, lines
+                    position += sum(map(len, lines))
+                    lines, records = [], 0
+        if lines:
+            yield header, position, lines
+
+
+def convert_chunk(table_name, header, position, lines):
+    """Разбор, приведение типов и проверка пачки записей.
+
+    Выполняется и в процессах-обработчиках, поэтому принимает и
+    возвращает только сериализуемые значения.
+    """
+    table = get_table(table_name)
+    rows = []
+    for record, offset in parse_records(lines, position):
+        try:
+            rows.append((table.convert(dict(zip(header, record))), offset))
+        except (KeyError, ValueError) as error:
+            raise LoadError(
+                f'{table.filename}, запись до {offset} байта: {error}'
+            ) from error
+    return rows
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def reset_sequences(models):
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+class Checkpoint:
+    """Состояние загрузки в JSON-файле: контрольная точка таблицы или
+    список удалённых на время загрузки индексов.
+
+    Записывается после каждой зафиксированной пачки заменой файла целиком,
+    поэтому при падении процесса остаётся последняя полная версия.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        try:
+            with open(self.path, encoding='utf-8') as checkpoint_file:
+                return json.load(checkpoint_file)
+        except FileNotFoundError:
+            return None
+
+    def save(self, **state):
+        temporary = f'{self.path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as checkpoint_file:
+            json.dump(state, checkpoint_file)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+        os.replace(temporary, self.path)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def get_pragma(cursor, name):
+    cursor.execute(f'PRAGMA {name}')
+    return cursor.fetchone()[0]
+
+
+def set_pragmas(pragmas):
+    with connection.cursor() as cursor:
+        for name, value in pragmas:
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def get_secondary_indexes(tables):
+    """Неуникальные индексы таблиц с SQL для их пересоздания."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+            "AND sql IS NOT NULL AND sql NOT LIKE 'CREATE UNIQUE%%' "
+            f"AND tbl_name IN ({', '.join(['%s'] * len(tables))})",
+            tables
+        )
+        return cursor.fetchall()
+
+
+def create_indexes(indexes):
+    with connection.cursor() as cursor:
+        for _, sql in indexes:
+            cursor.execute(
+                sql.replace('CREATE INDEX', 'CREATE INDEX IF NOT EXISTS', 1)
+            )
+
+
+@contextmanager
+def fast_load(models):
+    """Профиль быстрой начальной загрузки в SQLite.
+
+    Включает `FAST_LOAD_PRAGMAS` и удаляет неуникальные индексы таблиц
+    `models`, чтобы они строились один раз в конце, а не при каждой
+    вставке. На выходе, в том числе после ошибки или прерывания,
+    индексы создаются заново, прежние настройки возвращаются и
+    выполняется ANALYZE.
+
+    Удалённые индексы записываются рядом с файлом базы: если процесс
+    был убит, следующая быстрая загрузка сначала восстановит их.
+    """
+    if connection.vendor != 'sqlite':
+        yield
+        return
+    if connection.in_atomic_block:
+        raise LoadError('Быструю загрузку нельзя выполнять в транзакции')
+    backup = None
+    if not connection.is_in_memory_db():
+        backup = Checkpoint(
+            f'{connection.settings_dict["NAME"]}.indexes.json'
+        )
+        state = backup.load()
+        if state:
+            create_indexes(state['indexes'])
+            backup.clear()
+    tables = [model._meta.db_table for model in models]
+    with connection.cursor() as cursor:
+        saved = [
+            (name, get_pragma(cursor, name)) for name, _ in FAST_LOAD_PRAGMAS
+        ]
+    indexes = get_secondary_indexes(tables)
+    if backup:
+        backup.save(indexes=indexes)
+    try:
+        set_pragmas(FAST_LOAD_PRAGMAS)
+        with connection.cursor() as cursor:
+            for name, _ in indexes:
+                cursor.execute(f'DROP INDEX "{name}"')
+        yield
+    finally:
+        create_indexes(indexes)
+        if backup:
+            backup.clear()
+        with connection.cursor() as cursor:
+            for table in tables:
+                cursor.execute(f'ANALYZE "{table}"')
+        set_pragmas(saved)
+
+
+class TableLoad:
+    """Ход и итог загрузки одной таблицы."""
+
+    def __init__(self, table, size, rows=0, offset=0, done=False):
+        self.table = table
+        self.size = size
+        self.rows = rows
+        self.offset = offset
+        self.done = done
+        self.loaded = 0
+        self.start = default_timer()
+
+    @property
+    def elapsed(self):
+        return default_timer() - self.start
+
+    @property
+    def rate(self):
+        elapsed = self.elapsed
+        return self.loaded / elapsed if elapsed else 0
+
+    def progress(self):
+        percent = self.offset * 100 / self.size if self.size else 100
+        return (
+            f'{self.table.name}: {self.rows} строк, {percent:.1f}% файла, '
+            f'{self.rate:.0f} строк/с'
+        )
+
+    def __str__(self):
+        return (
+            f'{self.table.name}: {self.loaded} строк за {self.elapsed:.2f} с '
+            f'({self.rate:.0f} строк/с)'
+        )
+
+
+class TableLoader:
+    """Потоковая загрузка CSV: чтение, приведение типов, пачки, запись.
+
+    После каждой пачки, зафиксированной в своей транзакции, сохраняется
+    контрольная точка со смещением в файле и последним id, так что
+    прерванную загрузку можно продолжить с того же места.
+
+    При `workers` > 1 разбор и проверка пачек идут в пуле процессов,
+    а запись остаётся в текущем процессе: SQLite допускает одного
+    писателя.
+    """
+
+    def __init__(self, table, path, batch_size=LOAD_BATCH_SIZE,
+                 checkpoint=None, progress=None,
+                 progress_interval=PROGRESS_INTERVAL, workers=1):
+        self.table = table
+        self.path = path
+        self.batch_size = batch_size
+        self.checkpoint = checkpoint
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.workers = workers
+
+    def iter_rows(self, offset=0):
+        """Приведённые значения записей со смещением после каждой."""
+        chunks = read_chunks(self.path, offset, self.batch_size)
+        if self.workers <= 1:
+            for chunk in chunks:
+                yield from convert_chunk(self.table.name, *chunk)
+            return
+        with ProcessPoolExecutor(
+            self.workers, initializer=django.setup
+        ) as executor:
+            # Порядок пачек сохраняется, а число пачек в работе ограничено,
+            # чтобы память не росла, если запись отстаёт от разбора.
+            pending = deque()
+            for chunk in chunks:
+                pending.append(
+                    executor.submit(convert_chunk, self.table.name, *chunk)
+                )
+                if len(pending) > self.workers * 2:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def get_resume_state(self, size):
+        state = self.checkpoint.load() if self.checkpoint else None
+        if state is None:
+            return None
+        if state['size'] != size:
+            raise LoadError(
+                f'{self.table.filename} изменился после контрольной точки'
+            )
+        last_id = state['last_id']
+        if last_id is not None and not self.table.model.objects.filter(
+            pk=last_id
+        ).exists():
+            raise LoadError(
+                f'{self.table.name}: запись {last_id} из контрольной точки '
+                'не найдена в базе'
+            )
+        return state
+
+    def skip_loaded(self, batch):
+        """Пачка могла быть зафиксирована, а контрольная точка — нет."""
+        ids = [values['id'] for values, _ in batch]
+        loaded = set(self.table.model.objects.filter(
+            pk__in=ids
+        ).values_list('pk', flat=True))
+        return [item for item in batch if item[0]['id'] not in loaded]
+
+    def write(self, batch):
+        with transaction.atomic():
+            self.table.model.objects.bulk_create(
+                [self.table.build(values) for values, _ in batch]
+            )
+
+    def save_checkpoint(self, result, last_id):
+        if self.checkpoint:
+            self.checkpoint.save(
+                size=result.size, offset=result.offset, last_id=last_id,
+                rows=result.rows, done=result.done
+            )
+
+    def run(self, resume=False):
+        size = os.path.getsize(self.path)
+        state = self.get_resume_state(size) if resume else None
+        if state and state['done']:
+            return TableLoad(self.table, size, state['rows'], size, True)
+        result = TableLoad(self.table, size)
+        last_id = None
+        if state:
+            result.rows, result.offset = state['rows'], state['offset']
+            last_id = state['last_id']
+        reported = default_timer()
+        rows = self.iter_rows(result.offset)
+        with keep_auto_now(self.table.model):
+            for number, batch in enumerate(batched(rows, self.batch_size)):
+                fresh = batch
+                if state and number == 0:
+                    fresh = self.skip_loaded(batch)
+                if fresh:
+                    self.write(fresh)
+                last_id = batch[-1][0]['id']
+                result.rows += len(batch)
+                result.loaded += len(fresh)
+                result.offset = batch[-1][1]
+                self.save_checkpoint(result, last_id)
+                if (
+                    self.progress
+                    and default_timer() - reported >= self.progress_interval
+                ):
+                    self.progress(result)
+                    reported = default_timer()
+        reset_sequences([self.table.model])
+        result.offset, result.done = size, True
+        self.save_checkpoint(result, last_id)
+        return result
+
+
+class TableSync:
+    """Инкрементальная синхронизация таблицы с CSV.
+
+    Для каждой строки хранится отпечаток содержимого (`ImportedRow`).
+    Строки пачки сверяются с отпечатками и с таблицей двумя запросами:
+    новые вставляются, изменённые обновляются через `bulk_update`,
+    остальные пропускаются. Строки, которых нет в CSV, удаляются только
+    при `delete_missing`.
+    """
+
+    def __init__(self, table, path, batch_size=LOAD_BATCH_SIZE, workers=1,
+                 delete_missing=False):
+        self.table = table
+        self.path = path
+        self.batch_size = batch_size
+        self.workers = workers
+        self.delete_missing = delete_missing
+        self.seen = set()
+        self.changed = set()
+        self.parents = set()
+        self.counts = {'inserted': 0, 'updated': 0, 'skipped': 0, 'deleted': 0}
+
+    def get_existing(self, ids):
+        """id строк, уже лежащих в таблице, с их родителем."""
+        column = self.table.parent or 'pk'
+        return dict(self.table.model.objects.filter(
+            pk__in=ids
+        ).values_list('pk', column))
+
+    def sync_batch(self, batch):
+        rows = {values['id']: values for values, _ in batch}
+        digests = {
+            pk: self.table.digest(values) for pk, values in rows.items()
+        }
+        stored = {
+            row_id: (pk, digest) for pk, row_id, digest in
+            ImportedRow.objects.filter(
+                table=self.table.name, row_id__in=rows
+            ).values_list('pk', 'row_id', 'digest')
+        }
+        existing = self.get_existing(list(rows))
+        changed = [
+            pk for pk in rows
+            if pk not in existing or stored.get(pk, (None, None))[1]
+            != digests[pk]
+        ]
+        self.counts['skipped'] += len(rows) - len(changed)
+        if not changed:
+            return
+        build = self.table.build
+        inserts = [build(rows[pk]) for pk in changed if pk not in existing]
+        updates = [build(rows[pk]) for pk in changed if pk in existing]
+        with transaction.atomic():
+            self.table.model.objects.bulk_create(inserts)
+            self.table.model.objects.bulk_update(
+                updates, self.table.update_fields
+            )
+            ImportedRow.objects.bulk_update([
+                ImportedRow(pk=stored[pk][0], digest=digests[pk])
+                for pk in changed if pk in stored
+            ], ('digest',))
+            ImportedRow.objects.bulk_create([
+                ImportedRow(
+                    table=self.table.name, row_id=pk, digest=digests[pk]
+                ) for pk in changed if pk not in stored
+            ])
+        self.counts['inserted'] += len(inserts)
+        self.counts['updated'] += len(updates)
+        self.changed.update(changed)
+        if self.table.parent:
+            self.parents.update(existing[obj.pk] for obj in updates)
+            self.parents.update(
+                getattr(obj, self.table.parent) for obj in inserts + updates
+            )
+
+    def delete_rows(self):
+        """Удаляет строки, которых не было в CSV, проходя таблицу по pk."""
+        model = self.table.model
+        last_id = 0
+        while True:
+            rows = self.get_existing_after(last_id)
+            if not rows:
+                return
+            missing = {
+                pk: parent for pk, parent in rows if pk not in self.seen
+            }
+            if missing:
+                with transaction.atomic():
+                    model.objects.filter(pk__in=missing).delete()
+                    ImportedRow.objects.filter(
+                        table=self.table.name, row_id__in=missing
+                    ).delete()
+                self.counts['deleted'] += len(missing)
+                self.changed.update(missing)
+                if self.table.parent:
+                    self.parents.update(missing.values())
+            last_id = rows[-1][0]
+
+    def get_existing_after(self, last_id):
+        return list(self.table.model.objects.filter(
+            pk__gt=last_id
+        ).order_by('pk').values_list(
+            'pk', self.table.parent or 'pk'
+        )[:self.batch_size])
+
+    def run(self):
+        start = default_timer()
+        loader = TableLoader(
+            self.table, self.path, self.batch_size, workers=self.workers
+        )
+        with keep_auto_now(self.table.model):
+            for batch in batched(loader.iter_rows(), self.batch_size):
+                if self.delete_missing:
+                    self.seen.update(values['id'] for values, _ in batch)
+                self.sync_batch(batch)
+        if self.delete_missing:
+            self.delete_rows()
+        reset_sequences([self.table.model])
+        self.elapsed = default_timer() - start
+        return self
+
+    def __str__(self):
+        return (
+            f'{self.table.name}: добавлено {self.counts["inserted"]}, '
+            f'обновлено {self.counts["updated"]}, без изменений '
+            f'{self.counts["skipped"]}, удалено {self.counts["deleted"]} '
+            f'за {self.elapsed:.2f} с'
+        )
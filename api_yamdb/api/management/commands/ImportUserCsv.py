@@ -1,28 +0,0 @@
-import csv
-
-from django.core.management.base import BaseCommand
-
-from api.models import User
-
-
-class Command(BaseCommand):
-    help = 'Импорт данных из csv в таблицу User'
-
-    def add_arguments(self, parser):
-        parser.add_argument('path', type=str)
-
-    def handle(self, *args, **options):
-        file_path = options['path']
-        with open(file_path, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            next(reader)
-            for row in reader:
-                User.objects.create(
-                    id=row[0],
-                    username=row[1],
-                    email=row[2],
-                    role=row[3],
-                    bio=row[4],
-                    first_name=row[5],
-                    last_name=row[6]
-                )
@@ -0,0 +1,96 @@
+import csv
+import tempfile
+from pathlib import Path
+from timeit import default_timer
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+
+from api.loader import LOAD_BATCH_SIZE, TableLoader, get_table
+from reviews.models import Review, Title
+from users.models import User
+
+BENCH_AUTHORS = 10
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнение скорости загрузки отзывов из CSV при разном числе '
+        'процессов разбора (данные создаются и откатываются)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=50000)
+        parser.add_argument(
+            '--workers', type=int, nargs='+', default=[1, 2, 4, 8]
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=LOAD_BATCH_SIZE
+        )
+
+    def write_reviews(self, path, rows, title_ids, author_ids):
+        with open(path, 'w', encoding='utf-8', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(
+                ('id', 'title_id', 'text', 'author', 'score', 'pub_date')
+            )
+            first_id = (
+                Review.objects.aggregate(last_id=Max('pk'))['last_id'] or 0
+            ) + 1
+            for idx in range(rows):
+                writer.writerow((
+                    first_id + idx,
+                    title_ids[idx // BENCH_AUTHORS],
+                    f'Отзыв {idx}, "в кавычках"\nи на двух строках',
+                    author_ids[idx % BENCH_AUTHORS],
+                    idx % 10 + 1,
+                    '2020-01-13T23:20:02.422Z'
+                ))
+
+    def create_parents(self, rows):
+        User.objects.bulk_create(
+            User(username=f'bench_{idx}', email=f'bench_{idx}@yamdb.fake')
+            for idx in range(BENCH_AUTHORS)
+        )
+        Title.objects.bulk_create(
+            Title(name=f'bench title {idx}', year=2000, description='')
+            for idx in range(rows // BENCH_AUTHORS + 1)
+        )
+        return (
+            list(Title.objects.filter(
+                name__startswith='bench title'
+            ).order_by('pk').values_list('pk', flat=True)),
+            list(User.objects.filter(
+                username__startswith='bench_'
+            ).order_by('pk').values_list('pk', flat=True)),
+        )
+
+    def measure(self, loader, rows):
+        start = default_timer()
+        for _ in loader.iter_rows():
+            pass
+        parsed = default_timer() - start
+        with transaction.atomic():
+            start = default_timer()
+            loader.run()
+            loaded = default_timer() - start
+            transaction.set_rollback(True)
+        return rows / parsed, rows / loaded
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        table = get_table('review')
+        with tempfile.TemporaryDirectory() as directory, \
+                transaction.atomic():
+            path = Path(directory) / table.filename
+            self.write_reviews(path, rows, *self.create_parents(rows))
+            for workers in options['workers']:
+                parsed, loaded = self.measure(TableLoader(
+                    table, path, options['batch_size'], workers=workers
+                ), rows)
+                self.stdout.write(
+                    f'Процессов: {workers}: разбор {parsed:.0f} строк/с, '
+                    f'загрузка {loaded:.0f} строк/с'
+                )
+            transaction.set_rollback(True)
@@ -0,0 +1,82 @@
+from timeit import default_timer
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.serializers import TitleRowSerializer, TitleSerializer
+from reviews.models import Category, Genre, Title
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнение скорости TitleSerializer и TitleRowSerializer на списке '
+        'произведений (данные создаются и откатываются)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def create_catalog(self, rows):
+        Category.objects.bulk_create(
+            Category(name=f'bench category {idx}', slug=f'bench-cat-{idx}')
+            for idx in range(5)
+        )
+        Genre.objects.bulk_create(
+            Genre(name=f'bench genre {idx}', slug=f'bench-genre-{idx}')
+            for idx in range(10)
+        )
+        categories = list(Category.objects.filter(slug__startswith='bench-'))
+        genres = list(Genre.objects.filter(slug__startswith='bench-'))
+        Title.objects.bulk_create(
+            Title(
+                name=f'bench title {idx}', year=2000,
+                description='description ' * 20,
+                category=categories[idx % len(categories)],
+                score_sum=idx % 50, reviews_count=idx % 7
+            )
+            for idx in range(rows)
+        )
+        title_ids = list(Title.objects.filter(
+            name__startswith='bench title'
+        ).values_list('pk', flat=True))
+        Title.genre.through.objects.bulk_create(
+            Title.genre.through(
+                title_id=title_id, genre=genres[(title_id + shift) % 10]
+            )
+            for title_id in title_ids for shift in range(3)
+        )
+        return len(title_ids)
+
+    def measure(self, serialize, repeat):
+        best = None
+        for _ in range(repeat):
+            start = default_timer()
+            serialize()
+            elapsed = default_timer() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rows = self.create_catalog(options['rows'])
+            queryset = Title.objects.filter(name__startswith='bench title')
+            columns = TitleRowSerializer.get_columns(
+                TitleSerializer.Meta.fields
+            )
+            paths = (
+                ('TitleSerializer', lambda: TitleSerializer(
+                    queryset.select_related('category')
+                    .prefetch_related('genre'), many=True
+                ).data),
+                ('TitleRowSerializer', lambda: TitleRowSerializer(
+                    queryset.values(*columns)
+                ).data),
+            )
+            for name, serialize in paths:
+                elapsed = self.measure(serialize, options['repeat'])
+                self.stdout.write(
+                    f'{name}: {rows / elapsed:.0f} строк/с '
+                    f'({elapsed * 1000:.1f} мс на {rows} строк)'
+                )
+            transaction.set_rollback(True)
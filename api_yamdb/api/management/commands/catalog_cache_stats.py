@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from api.cache import get_cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Попадания и промахи кэша каталога по всем процессам сервера'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset', action='store_true',
+            help='Обнулить счётчики после вывода'
+        )
+
+    def handle(self, *args, **options):
+        for resource, stats in get_cache_stats().items():
+            total = stats['hits'] + stats['misses']
+            ratio = stats['hits'] / total if total else 0
+            self.stdout.write(
+                f'{resource}: попаданий {stats["hits"]}, '
+                f'промахов {stats["misses"]}, доля попаданий {ratio:.0%}'
+            )
+        if options['reset']:
+            reset_cache_stats()
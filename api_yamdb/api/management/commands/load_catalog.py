@@ -0,0 +1,193 @@
+from contextlib import nullcontext
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api.cache import bump_catalog_version
+from api.loader import (
+    LOAD_BATCH_SIZE, PROGRESS_INTERVAL, TABLES, Checkpoint, LoadError,
+    TableLoader, TableSync, batched, fast_load
+)
+from reviews.models import Review, Title
+from reviews.search import index_titles
+
+
+class Command(BaseCommand):
+    help = (
+        'Загрузка каталога из CSV-файлов `static/data` в порядке '
+        'зависимостей: пользователи, категории, жанры, произведения, '
+        'жанры произведений, отзывы, комментарии'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', type=Path, default=settings.BASE_DIR / 'static/data'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=LOAD_BATCH_SIZE
+        )
+        parser.add_argument(
+            '--tables', nargs='+', choices=[table.name for table in TABLES],
+            help='Загрузить только перечисленные таблицы'
+        )
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Продолжить прерванную загрузку с контрольных точек'
+        )
+        parser.add_argument(
+            '--checkpoint-dir', type=Path, default=None,
+            help='Каталог контрольных точек (по умолчанию --path)'
+        )
+        parser.add_argument(
+            '--progress-interval', type=float, default=PROGRESS_INTERVAL
+        )
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Процессов для разбора и проверки CSV'
+        )
+        parser.add_argument(
+            '--sync', action='store_true',
+            help=(
+                'Инкрементальная синхронизация по отпечаткам строк: новые '
+                'строки добавляются, изменённые обновляются'
+            )
+        )
+        parser.add_argument(
+            '--delete-missing', action='store_true',
+            help='При --sync удалить строки, которых нет в CSV'
+        )
+        parser.add_argument(
+            '--fast', action='store_true',
+            help=(
+                'Начальная загрузка в SQLite: журнал WAL без синхронизации '
+                'с диском, большой кэш, неуникальные индексы строятся после '
+                'загрузки; затем ANALYZE и прежние настройки'
+            )
+        )
+
+    def get_checkpoint(self, table, options):
+        directory = options['checkpoint_dir'] or options['path']
+        return Checkpoint(directory / f'{table.filename}.checkpoint.json')
+
+    def handle(self, *args, **options):
+        tables = [
+            table for table in TABLES
+            if not options['tables'] or table.name in options['tables']
+        ]
+        if options['sync']:
+            if options['resume']:
+                raise CommandError('--sync не использует контрольные точки')
+            if options['fast']:
+                raise CommandError('--sync нельзя совмещать с --fast')
+            return self.sync(tables, options)
+        if options['delete_missing']:
+            raise CommandError('--delete-missing работает только с --sync')
+        checkpoints = []
+        profile = (
+            fast_load([table.model for table in tables]) if options['fast']
+            else nullcontext()
+        )
+        try:
+            with profile:
+                for table in tables:
+                    checkpoint = self.load(table, options)
+                    if checkpoint:
+                        checkpoints.append(checkpoint)
+        except LoadError as error:
+            raise CommandError(str(error))
+        self.refresh_derived_data()
+        for checkpoint in checkpoints:
+            checkpoint.clear()
+
+    def load(self, table, options):
+        path = options['path'] / table.filename
+        if not path.exists():
+            self.stderr.write(f'{table.name}: файл {path} не найден')
+            return None
+        checkpoint = self.get_checkpoint(table, options)
+        result = TableLoader(
+            table, path, options['batch_size'], checkpoint,
+            progress=lambda result: self.stdout.write(result.progress()),
+            progress_interval=options['progress_interval'],
+            workers=options['workers']
+        ).run(resume=options['resume'])
+        self.stdout.write(str(result))
+        return checkpoint
+
+    def refresh_derived_data(self):
+        """`bulk_create` не вызывает сигналы: рейтинги, счётчики
+        комментариев, поисковый индекс и версии кэша обновляются после
+        загрузки."""
+        for command in (
+            'recompute_ratings', 'recompute_comment_counters',
+            'rebuild_title_search'
+        ):
+            call_command(command, stdout=self.stdout, stderr=self.stderr)
+        for resource in ('categories', 'genres', 'users'):
+            bump_catalog_version(resource)
+
+    def sync(self, tables, options):
+        self.synced = {}
+        try:
+            for table in tables:
+                path = options['path'] / table.filename
+                if not path.exists():
+                    self.stderr.write(f'{table.name}: файл {path} не найден')
+                    continue
+                self.synced[table.name] = TableSync(
+                    table, path, options['batch_size'], options['workers'],
+                    options['delete_missing']
+                ).run()
+                self.stdout.write(str(self.synced[table.name]))
+        finally:
+            self.refresh_changed_data(options['batch_size'])
+
+    def changed(self, name):
+        return self.synced[name].changed if name in self.synced else set()
+
+    def parents(self, name):
+        return self.synced[name].parents if name in self.synced else set()
+
+    def refresh_changed_data(self, batch_size):
+        """Рейтинги, счётчики, поисковый индекс и версии кэша только для
+        строк, которые синхронизация изменила."""
+        for ids in batched(sorted(self.parents('review')), batch_size):
+            with transaction.atomic():
+                Title.objects.filter(pk__in=ids).refresh_ratings()
+        for ids in batched(sorted(self.parents('comments')), batch_size):
+            with transaction.atomic():
+                Review.objects.filter(pk__in=ids).refresh_comment_counters()
+        if self.changed('category') or self.changed('genre'):
+            call_command(
+                'rebuild_title_search', stdout=self.stdout,
+                stderr=self.stderr
+            )
+        else:
+            for ids in batched(sorted(
+                self.changed('titles') | self.parents('genre_title')
+            ), batch_size):
+                index_titles(Title.objects.filter(pk__in=ids))
+        self.bump_changed_versions()
+
+    def bump_changed_versions(self):
+        for title_id in (
+            self.changed('titles') | self.parents('genre_title')
+            | self.parents('review')
+        ):
+            bump_catalog_version(f'title:{title_id}')
+        for title_id in self.parents('review'):
+            bump_catalog_version(f'reviews:{title_id}')
+        for review_id in self.parents('comments'):
+            bump_catalog_version(f'comments:{review_id}')
+        for resource, names in (
+            ('titles', ('titles', 'genre_title', 'review', 'category',
+                        'genre')),
+            ('categories', ('category',)),
+            ('genres', ('genre',)),
+            ('users', ('users',)),
+        ):
+            if any(self.changed(name) for name in names):
+                bump_catalog_version(resource)
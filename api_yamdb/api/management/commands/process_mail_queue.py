@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.mail import get_mail_stats, process_mail_queue
+
+
+class Command(BaseCommand):
+    help = 'Отправка писем из очереди пачками через одно соединение'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument(
+            '--watch', action='store_true',
+            help='Не завершаться, а проверять очередь каждые --interval секунд'
+        )
+        parser.add_argument('--interval', type=float, default=5)
+
+    def handle(self, *args, **options):
+        while True:
+            sent = process_mail_queue(options['batch_size'])
+            if sent or not options['watch']:
+                stats = get_mail_stats()
+                self.stdout.write(
+                    f'Отправлено: {sent}; всего отправлено: {stats["sent"]}, '
+                    f'ошибок: {stats["failed"]}, отброшено: '
+                    f'{stats["dropped"]}, в очереди: {stats["pending"]}'
+                )
+            if not options['watch']:
+                return
+            time.sleep(options['interval'])
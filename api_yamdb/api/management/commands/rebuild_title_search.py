@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.cache import bump_catalog_version
+from reviews.search import is_search_available, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Перестроение полнотекстового индекса произведений'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if not is_search_available():
+            self.stderr.write('Полнотекстовый индекс доступен только в SQLite')
+            return
+        with transaction.atomic():
+            total = rebuild_search_index(options['chunk_size'])
+        bump_catalog_version('titles')
+        self.stdout.write(f'Проиндексировано произведений: {total}')
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.cache import bump_catalog_version
+from reviews.models import Review
+
+
+class Command(BaseCommand):
+    help = 'Пересчёт счётчиков комментариев у отзывов'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        last_id = 0
+        total = 0
+        while True:
+            ids = list(
+                Review.objects.filter(pk__gt=last_id).order_by('pk')
+                .values_list('pk', flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+            reviews = Review.objects.filter(pk__in=ids)
+            with transaction.atomic():
+                total += reviews.refresh_comment_counters()
+            for title_id in set(reviews.values_list('title_id', flat=True)):
+                bump_catalog_version(f'reviews:{title_id}')
+            last_id = ids[-1]
+        self.stdout.write(f'Пересчитано отзывов: {total}')
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.cache import bump_catalog_version
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = 'Пересчёт сохранённых рейтингов произведений по отзывам'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        last_id = 0
+        total = 0
+        while True:
+            ids = list(
+                Title.objects.filter(pk__gt=last_id).order_by('pk')
+                .values_list('pk', flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+            with transaction.atomic():
+                total += Title.objects.filter(pk__in=ids).refresh_ratings()
+            for title_id in ids:
+                bump_catalog_version(f'title:{title_id}')
+            last_id = ids[-1]
+        bump_catalog_version('titles')
+        self.stdout.write(f'Пересчитано произведений: {total}')
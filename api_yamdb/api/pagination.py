@@ -0,0 +1,215 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from datetime import datetime
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework import exceptions
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import (
+    LimitOffsetPagination, PageNumberPagination
+)
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPaginationMixin:
+    """Необязательная keyset-пагинация по параметру `?cursor=`.
+
+    Без параметра `cursor` работает исходная пагинация класса-родителя.
+    С ним страницы выбираются условием по последней показанной записи
+    в порядке `ordering`, без COUNT(*) и OFFSET. Если запрос задаёт
+    сортировку через `OrderingFilter` вьюсета, ключ строится по ней.
+    Размер страницы берёт `get_cursor_page_size()`. Поиск с ранжированием
+    по релевантности не даёт ключа сортировки и вместе с cursor
+    отклоняется ошибкой 400.
+    """
+    cursor_query_param = 'cursor'
+    cursor_page_size = api_settings.PAGE_SIZE
+    ordering = ('id',)
+    invalid_cursor_message = 'Некорректный cursor.'
+    invalid_ordering_message = (
+        'Сортировка по полю `{field}` не поддерживается вместе с cursor.'
+    )
+    ranked_search_message = (
+        'Результаты поиска упорядочены по релевантности и не поддерживают '
+        'cursor.'
+    )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.cursor_query_param in request.query_params
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.check_ranked_search(request, view)
+        self.ordering = self.get_view_ordering(queryset, request, view)
+        page_size = self.get_cursor_page_size(request)
+        position, self.reverse = self.decode_cursor(
+            request.query_params[self.cursor_query_param]
+        )
+        ordering = self.get_ordering(self.reverse)
+        queryset = queryset.order_by(*ordering)
+        try:
+            if position is not None:
+                position = self.clean_position(queryset.model, position)
+                queryset = queryset.filter(self.get_keyset_filter(position))
+            page = list(queryset[:page_size + 1])
+        except (ValidationError, ValueError, TypeError, OverflowError):
+            raise NotFound(self.invalid_cursor_message)
+        has_more = len(page) > page_size
+        page = page[:page_size]
+        if self.reverse:
+            page.reverse()
+
+        if self.reverse:
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        self.page = page
+        return page
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_cursor_link(reverse=False)),
+            ('previous', self.get_cursor_link(reverse=True)),
+            ('results', data),
+        ]))
+
+    def get_cursor_page_size(self, request):
+        return self.cursor_page_size
+
+    def check_ranked_search(self, request, view):
+        for backend in getattr(view, 'filter_backends', ()):
+            if not hasattr(backend, 'get_ranked_param'):
+                continue
+            param = backend().get_ranked_param(request)
+            if param is not None:
+                raise exceptions.ValidationError({
+                    param: [self.ranked_search_message]
+                })
+
+    def get_view_ordering(self, queryset, request, view):
+        """Сортировка из `?ordering=`, проверенная для keyset-пагинации.
+
+        Ключ должен заканчиваться на id и состоять из полей модели без
+        NULL: иначе условие по последней записи теряет строки.
+        """
+        for backend in getattr(view, 'filter_backends', ()):
+            if not issubclass(backend, OrderingFilter) or (
+                backend.ordering_param not in request.query_params
+            ):
+                continue
+            ordering = tuple(backend().get_ordering(request, queryset, view))
+            if not ordering or ordering[-1].lstrip('-') not in ('id', 'pk'):
+                ordering = (*ordering, 'id')
+            for field in ordering:
+                name = field.lstrip('-')
+                if name == 'pk':
+                    continue
+                try:
+                    model_field = queryset.model._meta.get_field(name)
+                except FieldDoesNotExist:
+                    model_field = None
+                if model_field is None or model_field.null:
+                    raise exceptions.ValidationError({
+                        backend.ordering_param: [
+                            self.invalid_ordering_message.format(field=name)
+                        ]
+                    })
+            return ordering
+        return self.ordering
+
+    def get_ordering(self, reverse=False):
+        if not reverse:
+            return self.ordering
+        return tuple(
+            field[1:] if field.startswith('-') else f'-{field}'
+            for field in self.ordering
+        )
+
+    def get_keyset_filter(self, position):
+        keyset_filter = Q()
+        equal = Q()
+        for field, value in zip(self.get_ordering(self.reverse), position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            keyset_filter |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return keyset_filter
+
+    def clean_position(self, model, position):
+        """Приводит значения из cursor к типам полей сортировки."""
+        cleaned = []
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            model_field = (
+                model._meta.pk if name == 'pk' else model._meta.get_field(name)
+            )
+            if value is None:
+                raise ValidationError('Пустое значение в cursor.')
+            value = model_field.to_python(value)
+            model_field.run_validators(value)
+            cleaned.append(value)
+        return cleaned
+
+    def get_position(self, obj):
+        position = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            value = obj[name] if isinstance(obj, dict) else getattr(obj, name)
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            position.append(value)
+        return position
+
+    def get_cursor_link(self, reverse):
+        if not (self.has_previous if reverse else self.has_next):
+            return None
+        url = self.request.build_absolute_uri()
+        if not self.page:
+            return remove_query_param(url, self.cursor_query_param)
+        obj = self.page[0] if reverse else self.page[-1]
+        return replace_query_param(
+            url, self.cursor_query_param,
+            self.encode_cursor(self.get_position(obj), reverse)
+        )
+
+    def encode_cursor(self, position, reverse):
+        data = json.dumps({'p': position, 'r': int(reverse)})
+        return urlsafe_b64encode(data.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return None, False
+        try:
+            data = json.loads(urlsafe_b64decode(cursor.encode()))
+            position, reverse = data['p'], bool(data['r'])
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or (
+            len(position) != len(self.ordering)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+
+class TitlePagination(KeysetPaginationMixin, LimitOffsetPagination):
+    ordering = ('name', 'id')
+
+    def get_cursor_page_size(self, request):
+        return self.get_limit(request)
+
+
+class ReviewPagination(KeysetPaginationMixin, PageNumberPagination):
+    ordering = ('-pub_date', 'id')
+
+
+class CommentPagination(KeysetPaginationMixin, PageNumberPagination):
+    ordering = ('pub_date', 'id')
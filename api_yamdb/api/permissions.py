@@ -22,10 +22,11 @@ class ReviewPermission(permissions.BasePermission):
                 or request.user.is_authenticated)
 
     def has_object_permission(self, request, view, obj):
+        """Сравнивает `author_id`, не загружая автора объекта."""
         return (request.method in permissions.SAFE_METHODS
+                or obj.author_id == request.user.pk
                 or request.user.is_admin
-                or request.user.is_moderator
-                or obj.author == request.user)
+                or request.user.is_moderator)
 
 
 class IsAdminOnlyPermission(permissions.BasePermission):
@@ -37,6 +38,16 @@ class IsAdminOnlyPermission(permissions.BasePermission):
         return False
 
 
+class IsModeratorOrAdminPermission(permissions.BasePermission):
+    """Обеспечивает доступ только модераторам и админам."""
+
+    def has_permission(self, request, view):
+        if request.user.is_authenticated:
+            return (request.user.is_admin or request.user.is_moderator
+                    or request.user.is_superuser)
+        return False
+
+
 class SelfEditUserOnlyPermission(permissions.BasePermission):
     """Обеспечивает доступ к users/me только самим user-ам."""
 
@@ -44,4 +55,4 @@ class SelfEditUserOnlyPermission(permissions.BasePermission):
         return (request.user.is_authenticated)
 
     def has_object_permission(self, request, view, obj):
-        return (obj.id == request.user)
+        return (obj.pk == request.user.pk)
@@ -1,12 +1,46 @@
+from collections import OrderedDict, defaultdict
 from datetime import datetime as dt
 
-from django.shortcuts import get_object_or_404
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils.text import Truncator
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
 
 from reviews.models import Category, Genre, Title, Comment, Review
-from api.validators import validate_username, validate_email
+from api.validators import (
+    EMAIL_TAKEN_MESSAGE, REVIEW_EXISTS_MESSAGE, USERNAME_TAKEN_MESSAGE,
+    validate_username
+)
 from users.models import User
 
+REVIEW_PREVIEW_LENGTH = 100
+
+
+def get_sparse_fields(request, fields):
+    """Имена полей, оставшиеся после `?fields=` и `?omit=`."""
+    selected = set(fields)
+    if request is None or request.method not in SAFE_METHODS:
+        return selected
+    requested = request.query_params.get('fields')
+    if requested:
+        selected &= {name.strip() for name in requested.split(',')}
+    omitted = request.query_params.get('omit')
+    if omitted:
+        selected -= {name.strip() for name in omitted.split(',')}
+    return selected
+
+
+class SparseFieldsetMixin:
+    """Сериализует только поля, запрошенные через `?fields=`/`?omit=`."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = get_sparse_fields(self.context.get('request'), self.fields)
+        for name in set(self.fields) - selected:
+            self.fields.pop(name)
+
 
 class CategorySerializer(serializers.ModelSerializer):
     class Meta():
@@ -26,7 +60,7 @@ class GenreSerializer(serializers.ModelSerializer):
         model = Genre
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(many=True, read_only=True)
     rating = serializers.IntegerField(read_only=True)
@@ -44,6 +78,77 @@ class TitleSerializer(serializers.ModelSerializer):
         return value
 
 
+class TitleRowSerializer:
+    """Быстрое чтение списка произведений без моделей и ModelSerializer.
+
+    Строки берутся из `values()`, жанры страницы загружаются одним
+    запросом; JSON совпадает с `TitleSerializer` побайтно.
+    """
+    field_columns = {
+        'id': ('id',),
+        'name': ('name',),
+        'year': ('year',),
+        'description': ('description',),
+        'rating': ('score_sum', 'reviews_count'),
+        'category': ('category__name', 'category__slug'),
+        'genre': ('id',),
+    }
+
+    def __init__(self, rows, fields=TitleSerializer.Meta.fields):
+        self.rows = list(rows)
+        self.fields = [
+            name for name in TitleSerializer.Meta.fields if name in fields
+        ]
+
+    @classmethod
+    def get_columns(cls, fields):
+        # `name` и `id` нужны для сортировки и keyset-пагинации.
+        columns = {'name', 'id'}
+        for field in fields:
+            columns.update(cls.field_columns[field])
+        return columns
+
+    def get_genres(self):
+        genres = defaultdict(list)
+        if 'genre' not in self.fields:
+            return genres
+        rows = (
+            Title.genre.through.objects
+            .filter(title_id__in=[row['id'] for row in self.rows])
+            .order_by('genre_id')
+            .values_list('title_id', 'genre__name', 'genre__slug')
+        )
+        for title_id, name, slug in rows:
+            genres[title_id].append(
+                OrderedDict((('name', name), ('slug', slug)))
+            )
+        return genres
+
+    def to_representation(self, row, genres):
+        data = OrderedDict()
+        for field in self.fields:
+            if field == 'rating':
+                data[field] = (
+                    row['score_sum'] // row['reviews_count']
+                    if row['reviews_count'] else None
+                )
+            elif field == 'category':
+                data[field] = OrderedDict((
+                    ('name', row['category__name']),
+                    ('slug', row['category__slug']),
+                )) if row['category__slug'] is not None else None
+            elif field == 'genre':
+                data[field] = genres.get(row['id'], [])
+            else:
+                data[field] = row[field]
+        return data
+
+    @property
+    def data(self):
+        genres = self.get_genres()
+        return [self.to_representation(row, genres) for row in self.rows]
+
+
 class TitlePostSerializer(serializers.ModelSerializer):
     category = serializers.SlugRelatedField(
         slug_field='slug', queryset=Category.objects.all()
@@ -54,7 +159,7 @@ class TitlePostSerializer(serializers.ModelSerializer):
     )
 
     class Meta():
-        fields = '__all__'
+        fields = ('id', 'name', 'year', 'description', 'genre', 'category')
         model = Title
 
 
@@ -69,8 +174,7 @@ class TokenSerializer(serializers.Serializer):
 class SignUpSerializer(serializers.ModelSerializer):
     email = serializers.EmailField(
         max_length=254,
-        allow_blank=False,
-        validators=[validate_email]
+        allow_blank=False
     )
     username = serializers.CharField(
         max_length=150,
@@ -78,33 +182,96 @@ class SignUpSerializer(serializers.ModelSerializer):
         validators=[validate_username]
     )
 
+    def create(self, validated_data):
+        """Вставка без предварительных проверок. Если пара `username` и
+        `email` уже зарегистрирована, возвращается существующий
+        пользователь; занятые по отдельности имя или почта дают 400."""
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            user = self.get_registered_user(validated_data)
+            if user is None:
+                raise
+            return user
+
+    def get_registered_user(self, validated_data):
+        """Один запрос по обоим уникальным полям после конфликта."""
+        username = validated_data['username']
+        email = validated_data['email']
+        errors = {}
+        for user in User.objects.filter(
+            Q(username=username) | Q(email=email)
+        ).only('username', 'email', 'password', 'last_login'):
+            if user.username == username and user.email == email:
+                return user
+            if user.username == username:
+                errors['username'] = [USERNAME_TAKEN_MESSAGE]
+            if user.email == email:
+                errors['email'] = [EMAIL_TAKEN_MESSAGE]
+        if errors:
+            raise serializers.ValidationError(errors)
+        return None
+
     class Meta:
         model = User
         fields = ('email', 'username')
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True, slug_field='username'
     )
 
-    def validate(self, data):
-        request = self.context['request']
-        author = request.user
-        title_id = self.context['view'].kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
-        if request.method == 'POST':
-            if Review.objects.filter(title=title, author=author).exists():
-                raise serializers.ValidationError(
-                    'Вы можете добавить только один отзыв')
-        return data
+    def create(self, validated_data):
+        """Вставка без предварительной проверки: повтор отзыва ловит
+        ограничение `unique_author_title`."""
+        try:
+            return super().create(validated_data)
+        except IntegrityError:
+            if not Review.objects.filter(
+                title=validated_data['title'],
+                author=validated_data['author']
+            ).exists():
+                raise
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [REVIEW_EXISTS_MESSAGE]
+            })
 
     class Meta:
-        fields = ('id', 'text', 'author', 'score', 'pub_date')
+        fields = (
+            'id', 'text', 'author', 'score', 'pub_date',
+            'comments_count', 'last_comment_date'
+        )
         model = Review
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class BulkReviewSerializer(serializers.Serializer):
+    """Элемент пачки отзывов от партнёров."""
+    title = serializers.IntegerField()
+    author = serializers.CharField(max_length=150)
+    text = serializers.CharField()
+    score = serializers.IntegerField(min_value=1, max_value=10)
+
+
+def get_review_format(request):
+    """Вид поля `review` комментария из `?review_format=`."""
+    if request is None:
+        return 'text'
+    review_format = request.query_params.get('review_format', 'text')
+    if review_format not in ('text', 'id', 'preview'):
+        return 'text'
+    return review_format
+
+
+class ReviewPreviewField(serializers.RelatedField):
+    """Начало текста отзыва вместо полного текста."""
+
+    def to_representation(self, value):
+        return Truncator(value.text).chars(REVIEW_PREVIEW_LENGTH)
+
+
+class CommentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Сериализатор для комментариев."""
     author = serializers.SlugRelatedField(
         slug_field='username', read_only=True
@@ -112,13 +279,25 @@ class CommentSerializer(serializers.ModelSerializer):
     review = serializers.SlugRelatedField(
         slug_field='text', read_only=True
     )
+    review_fields = {
+        'id': serializers.PrimaryKeyRelatedField,
+        'preview': ReviewPreviewField,
+    }
 
     class Meta:
         model = Comment
         fields = ('id', 'text', 'review', 'author', 'pub_date')
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        review_format = get_review_format(self.context.get('request'))
+        if 'review' in self.fields and review_format in self.review_fields:
+            self.fields['review'] = self.review_fields[review_format](
+                read_only=True
+            )
+
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
 
     class Meta:
         model = User
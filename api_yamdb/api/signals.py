@@ -0,0 +1,86 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.core.cache import cache
+from django.dispatch import receiver
+
+from api.authentication import cache_token_version, get_token_version_key
+from api.cache import bump_catalog_version
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+
+@receiver((post_save, post_delete), sender=Title)
+def invalidate_titles(sender, instance, **kwargs):
+    bump_catalog_version('titles')
+    bump_catalog_version(f'title:{instance.pk}')
+
+
+@receiver(post_delete, sender=Title)
+def invalidate_deleted_title_reviews(sender, instance, **kwargs):
+    """Сбрасывает ETag списка отзывов удалённого произведения.
+
+    Иначе у произведения без отзывов старый ETag давал бы 304 вместо 404.
+    """
+    bump_catalog_version(f'reviews:{instance.pk}')
+
+
+@receiver((post_save, post_delete), sender=Review)
+def invalidate_reviews(sender, instance, **kwargs):
+    bump_catalog_version('titles')
+    bump_catalog_version(f'title:{instance.title_id}')
+    bump_catalog_version(f'reviews:{instance.title_id}')
+    bump_catalog_version(f'comments:{instance.pk}')
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def invalidate_comments(sender, instance, **kwargs):
+    bump_catalog_version(f'comments:{instance.review_id}')
+    if Comment.review.is_cached(instance):
+        title_id = instance.review.title_id
+    else:
+        title_id = Review.objects.filter(
+            pk=instance.review_id
+        ).values_list('title_id', flat=True).first()
+    bump_catalog_version(f'reviews:{title_id}')
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, instance, action, reverse, pk_set,
+                            **kwargs):
+    if not action.startswith('post_'):
+        return
+    bump_catalog_version('titles')
+    if not reverse:
+        bump_catalog_version(f'title:{instance.pk}')
+    elif pk_set:
+        for pk in pk_set:
+            bump_catalog_version(f'title:{pk}')
+    else:
+        bump_catalog_version('genres')
+
+
+@receiver((post_save, post_delete), sender=Genre)
+def invalidate_genres(sender, **kwargs):
+    bump_catalog_version('genres')
+    bump_catalog_version('titles')
+
+
+@receiver((post_save, post_delete), sender=Category)
+def invalidate_categories(sender, **kwargs):
+    bump_catalog_version('categories')
+    bump_catalog_version('titles')
+
+
+@receiver(post_save, sender=User)
+def invalidate_authors(sender, created, **kwargs):
+    if not created:
+        bump_catalog_version('users')
+
+
+@receiver(post_save, sender=User)
+def refresh_token_version(sender, instance, **kwargs):
+    cache_token_version(instance)
+
+
+@receiver(post_delete, sender=User)
+def forget_token_version(sender, instance, **kwargs):
+    cache.delete(get_token_version_key(instance.pk))
@@ -7,7 +7,7 @@ from api.views import (
     CategoryViewSet, GenreViewSet,
     TitleViewSet, ReviewViewSet,
     CommentViewSet, UserViewSet,
-    signup, token
+    bulk_reviews, signup, token
 )
 
 router_v1 = SimpleRouter()
@@ -37,6 +37,7 @@ auth_patterns = [
 
 urlpatterns = [
     path('v1/auth/', include(auth_patterns)),
+    path('v1/reviews/bulk/', bulk_reviews),
     path('v1/', include(router_v1.urls)),
     path('v1/', include(router_v2.urls)),
 ]
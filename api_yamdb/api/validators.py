@@ -2,24 +2,17 @@ import re
 
 from rest_framework.exceptions import ValidationError
 
-from users.models import User
+USERNAME_TAKEN_MESSAGE = 'Пользователь с таким именем уже зарегестрирован!'
+EMAIL_TAKEN_MESSAGE = 'Пользователь с такой почтой уже зарегестрирован'
+REVIEW_EXISTS_MESSAGE = 'Вы можете добавить только один отзыв'
 
 
 def validate_username(value):
+    """Проверки без запросов к базе: занятость имени ловит уникальный
+    индекс при вставке."""
     if value == 'me':
         raise ValidationError('Недопустимое имя пользователя!')
-    if User.objects.filter(username=value).exists():
-        raise ValidationError(
-            'Пользователь с таким именем уже зарегестрирован!'
-        )
     if not re.match(r'^[\w.@+-]', value):
         raise ValidationError(
             'Username не соответствует требованиям!'
         )
-
-
-def validate_email(value):
-    if User.objects.filter(email=value).exists():
-        raise ValidationError(
-            'Пользователь с такой почтой уже зарегестрирован'
-        )
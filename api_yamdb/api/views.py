@@ -1,31 +1,47 @@
+import json
+
 from django.shortcuts import get_object_or_404
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+from django.utils.functional import cached_property
 from django.contrib.auth.tokens import default_token_generator
 from rest_framework_simplejwt.tokens import RefreshToken
-from django.core.mail import send_mail
-from django.db.models import Avg
 from rest_framework import viewsets, mixins
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import SAFE_METHODS, AllowAny
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework import filters, status
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.pagination import PageNumberPagination
 
-from django.conf import settings
-from reviews.models import Category, Genre, Title, Review
+from reviews.models import Category, Comment, Genre, Title, Review
 from api.serializers import (
     CategorySerializer, GenreSerializer, TitleSerializer, TitlePostSerializer,
+    TitleRowSerializer,
     SignUpSerializer, TokenSerializer, CommentSerializer, ReviewSerializer,
-    UserSerializer, UserMeSerializer
+    UserSerializer, UserMeSerializer, get_review_format, get_sparse_fields
 )
 from api.permissions import (
     IsAdminOrReadOnly, ReviewPermission, IsAdminOnlyPermission,
-    SelfEditUserOnlyPermission
+    IsModeratorOrAdminPermission, SelfEditUserOnlyPermission
+)
+from api.authentication import add_token_claims
+from api.bulk import ReviewBatch
+from api.cache import CachedListMixin, CachedRetrieveMixin
+from api.conditional import ConditionalListMixin, ConditionalRetrieveMixin
+from api.filters import (
+    FilterTitle, StableOrderingFilter, TitleSearchFilter
+)
+from api.pagination import (
+    CommentPagination, ReviewPagination, TitlePagination
 )
-from api.filters import FilterTitle
+from users.mail import enqueue_mail
 from users.models import User
 
+BULK_REVIEWS_MAX_ITEMS = 10000
+EXPORT_CHUNK_SIZE = 2000
+
 
 class CreateListDestroy(
     mixins.CreateModelMixin,
@@ -36,7 +52,39 @@ class CreateListDestroy(
     pass
 
 
-class CategoryViewSet(CreateListDestroy):
+def stream_ndjson(*sources):
+    """Строки NDJSON из запросов, читаемых порциями через iterator()."""
+    for row_type, queryset in sources:
+        for row in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            row['type'] = row_type
+            row['author'] = row.pop('author__username')
+            yield json.dumps(row, cls=JSONEncoder, ensure_ascii=False) + '\n'
+
+
+class ParentObjectMixin:
+    """Родительские объекты из URL, загружаемые один раз за запрос.
+
+    Вьюсет, сериализатор (через `context['view']`) и разрешения
+    обращаются к `view.title` и `view.review` без повторных запросов.
+    """
+
+    @cached_property
+    def title(self):
+        return get_object_or_404(Title, pk=self.kwargs['title_id'])
+
+    @cached_property
+    def review(self):
+        return get_object_or_404(
+            self.get_review_queryset(), pk=self.kwargs['review_id'],
+            title_id=self.kwargs['title_id']
+        )
+
+    def get_review_queryset(self):
+        return Review.objects.all()
+
+
+class CategoryViewSet(CachedListMixin, CreateListDestroy):
+    cache_resource = 'categories'
     queryset = Category.objects.all()
     pagination_class = LimitOffsetPagination
     serializer_class = CategorySerializer
@@ -47,7 +95,8 @@ class CategoryViewSet(CreateListDestroy):
     search_fields = ('name', 'slug')
 
 
-class GenreViewSet(CreateListDestroy):
+class GenreViewSet(CachedListMixin, CreateListDestroy):
+    cache_resource = 'genres'
     queryset = Genre.objects.all()
     pagination_class = LimitOffsetPagination
     serializer_class = GenreSerializer
@@ -58,59 +107,150 @@ class GenreViewSet(CreateListDestroy):
     filterset_fields = ('name', 'slug')
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(ConditionalListMixin, ConditionalRetrieveMixin,
+                   CachedListMixin, CachedRetrieveMixin,
+                   viewsets.ModelViewSet):
+    cache_resource = 'titles'
     queryset = Title.objects.all()
-    pagination_class = LimitOffsetPagination
+    pagination_class = TitlePagination
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = (DjangoFilterBackend, filters.SearchFilter,)
+    filter_backends = (DjangoFilterBackend, TitleSearchFilter,)
     filterset_class = FilterTitle
-    search_fields = ('name', 'year', 'genre__slug', 'category__slug')
+    title_field_columns = {
+        'id': ('id',),
+        'name': ('name',),
+        'year': ('year',),
+        'description': ('description',),
+        'rating': ('score_sum', 'reviews_count'),
+        'category': ('category',),
+    }
 
     def get_serializer_class(self):
         if self.action in ('list', 'retrieve'):
             return TitleSerializer
         return TitlePostSerializer
 
+    def get_version_resources(self):
+        if self.action == 'retrieve':
+            return (f'title:{self.kwargs["pk"]}', 'genres', 'categories')
+        return ('titles',)
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action == 'list' and self.request.method in SAFE_METHODS:
+            return TitleRowSerializer(*args, fields=self.get_title_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def get_title_fields(self):
+        return get_sparse_fields(self.request, TitleSerializer.Meta.fields)
+
     def get_queryset(self):
-        if self.action in ('list', 'retrieve'):
-            queryset = (
-                Title.objects.prefetch_related('reviews').all().
-                annotate(rating=Avg('reviews__score')).order_by('name')
-            )
+        if self.action == 'list':
+            columns = TitleRowSerializer.get_columns(self.get_title_fields())
+            return Title.objects.order_by('name').values(*columns)
+        if self.action == 'retrieve':
+            fields = self.get_title_fields()
+            columns = {'name'}
+            for field in fields:
+                columns.update(self.title_field_columns.get(field, ()))
+            queryset = Title.objects.only(*columns).order_by('name')
+            if 'category' in fields:
+                queryset = queryset.select_related('category')
+            if 'genre' in fields:
+                queryset = queryset.prefetch_related(
+                    Prefetch('genre', queryset=Genre.objects.order_by('pk'))
+                )
             return queryset
         return Title.objects.all()
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ParentObjectMixin, ConditionalListMixin,
+                    ConditionalRetrieveMixin, viewsets.ModelViewSet):
     """Вьюсет для отзывов."""
     serializer_class = ReviewSerializer
     permission_classes = (ReviewPermission,)
+    pagination_class = ReviewPagination
+    filter_backends = (StableOrderingFilter,)
+    ordering_fields = (
+        'score', 'pub_date', 'comments_count', 'last_comment_date'
+    )
+    ordering = ('-pub_date', 'id')
+    ordering_tiebreakers = {'pub_date': '-id', '-score': '-id'}
+
+    def get_version_resources(self):
+        return (f'reviews:{self.kwargs["title_id"]}', 'users')
 
     def get_queryset(self):
-        title = get_object_or_404(Title, id=self.kwargs['title_id'])
-        return title.reviews.all()
+        fields = get_sparse_fields(
+            self.request, ReviewSerializer.Meta.fields
+        )
+        columns = [
+            'title', 'score', 'pub_date', 'comments_count',
+            'last_comment_date'
+        ]
+        if 'text' in fields:
+            columns.append('text')
+        queryset = self.title.reviews.all()
+        if 'author' in fields:
+            queryset = queryset.select_related('author')
+            columns.append('author__username')
+        return queryset.only(*columns)
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Title, id=self.kwargs['title_id'])
-        serializer.save(author=self.request.user, title=title)
+        serializer.save(author=self.request.user, title=self.title)
+
+    @action(
+        methods=['get'], detail=False, url_path='export',
+        permission_classes=(IsModeratorOrAdminPermission,)
+    )
+    def export(self, request, title_id=None):
+        """Все отзывы и комментарии произведения потоком NDJSON."""
+        reviews = Review.objects.filter(title=self.title).order_by('pk')
+        comments = Comment.objects.filter(
+            review__title=self.title
+        ).order_by('pk')
+        return StreamingHttpResponse(
+            stream_ndjson(
+                ('review', reviews.values(
+                    'id', 'author__username', 'text', 'score', 'pub_date'
+                )),
+                ('comment', comments.values(
+                    'id', 'review_id', 'author__username', 'text', 'pub_date'
+                )),
+            ),
+            content_type='application/x-ndjson'
+        )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ParentObjectMixin, ConditionalListMixin,
+                     ConditionalRetrieveMixin, viewsets.ModelViewSet):
     """Вьюсет для комментариев."""
     serializer_class = CommentSerializer
     permission_classes = (ReviewPermission,)
-    pagination_class = PageNumberPagination
+    pagination_class = CommentPagination
+
+    def get_version_resources(self):
+        return (f'comments:{self.kwargs["review_id"]}', 'users')
+
+    def get_review_queryset(self):
+        if get_review_format(self.request) == 'id':
+            return Review.objects.defer('text')
+        return Review.objects.all()
 
     def get_queryset(self):
-        review = get_object_or_404(Review, id=self.kwargs['review_id'])
-        return review.comments.all()
+        fields = get_sparse_fields(
+            self.request, CommentSerializer.Meta.fields
+        )
+        columns = ['review', 'pub_date']
+        if 'text' in fields:
+            columns.append('text')
+        queryset = self.review.comments.all()
+        if 'author' in fields:
+            queryset = queryset.select_related('author')
+            columns.append('author__username')
+        return queryset.only(*columns)
 
     def perform_create(self, serializer):
-        review = get_object_or_404(
-            Review, id=self.kwargs['review_id'],
-            title=self.kwargs['title_id']
-        )
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.review)
 
 
 class UserViewSet(viewsets.ModelViewSet):
@@ -128,11 +268,11 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def me(self, request):
         if request.method == 'GET':
-            user = User.objects.get(username=request.user)
+            user = User.objects.get(pk=request.user.pk)
             serializer = self.get_serializer(user)
             return Response(serializer.data)
 
-        user = User.objects.get(username=request.user)
+        user = User.objects.get(pk=request.user.pk)
         serializer = UserMeSerializer(user, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
@@ -144,30 +284,39 @@ class UserViewSet(viewsets.ModelViewSet):
 @permission_classes([AllowAny])
 def signup(request):
     serializer = SignUpSerializer(data=request.data)
-    if User.objects.filter(
-        username=request.data.get('username'), email=request.data.get('email')
-    ).exists():
-        return Response(request.data, status=status.HTTP_200_OK)
-    else:
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
-        user = User.objects.get(
-            username=request.data.get('username'),
-            email=request.data.get('email')
+    serializer.is_valid(raise_exception=True)
+    user = serializer.save()
+    conformation_code = default_token_generator.make_token(user)
+    enqueue_mail(
+        f'Привет, {str(user.username)}! Твой код находится тут!',
+        conformation_code,
+        user.email
+    )
+    return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminOnlyPermission])
+def bulk_reviews(request):
+    """Пакетная загрузка отзывов к разным произведениям."""
+    if not isinstance(request.data, list):
+        return Response(
+            {'non_field_errors': ['Ожидается список отзывов.']},
+            status=status.HTTP_400_BAD_REQUEST
         )
-        conformation_code = default_token_generator.make_token(user)
-        send_mail(
-            f'Привет, {str(user.username)}! Твой код находится тут!',
-            conformation_code,
-            settings.EMAIL_FOR_AUTH_LETTERS,
-            [request.data['email']],
-            fail_silently=True
+    if len(request.data) > BULK_REVIEWS_MAX_ITEMS:
+        return Response(
+            {'non_field_errors': [
+                f'Не больше {BULK_REVIEWS_MAX_ITEMS} отзывов за запрос.'
+            ]},
+            status=status.HTTP_400_BAD_REQUEST
         )
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    results = ReviewBatch(request.data).process()
+    return Response({'results': results}, status=status.HTTP_200_OK)
 
 
 def get_tokens_for_user(user):
-    refresh = RefreshToken.for_user(user)
+    refresh = add_token_claims(RefreshToken.for_user(user), user)
 
     return {
         'refresh': str(refresh),
@@ -73,6 +73,26 @@ DATABASES = {
 }
 
 
+# Cache
+
+# Кэш должен быть общим для всех процессов сервера: в нём хранятся
+# версии каталога для ETag и кэша ответов и версии прав пользователей.
+# LocMemCache у каждого процесса свой, и после изменения данных другие
+# процессы продолжали бы отдавать устаревшие ответы. В production файловый
+# кэш можно заменить на Redis или Memcached.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    }
+}
+
+CATALOG_CACHE_TIMEOUT = 60 * 15
+
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -116,12 +136,24 @@ EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
 EMAIL_FOR_AUTH_LETTERS = 'donotrespond@yamdb.com'
 
+# Очередь писем: `process_mail_queue` отправляет их пачками через одно
+# соединение. В режиме EAGER письмо уходит сразу после постановки в очередь.
+# Без EAGER коды подтверждения доставляются, только пока запущен
+# `python3 manage.py process_mail_queue --watch` (см. README).
+MAIL_QUEUE_EAGER = False
+
+MAIL_QUEUE_BATCH_SIZE = 100
+
+MAIL_QUEUE_MAX_ATTEMPTS = 5
+
+MAIL_QUEUE_RETRY_DELAY = 60
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
@@ -132,6 +164,12 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Сколько хранится в кэше версия прав пользователя, с которой сверяются
+# утверждения JWT безопасных запросов (GET, HEAD, OPTIONS). Ограничивает
+# задержку, если права менялись в обход сигналов (`QuerySet.update`).
+# Изменяющие запросы всегда сверяют версию с базой.
+AUTH_TOKEN_VERSION_TIMEOUT = 60 * 5
+
 AUTH_USER_MODEL = 'users.User'
 
 USER = 'user'
@@ -0,0 +1,64 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import reviews.models
+
+
+def create_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        'CREATE VIRTUAL TABLE reviews_title_search USING fts5('
+        'name, description, year, genres, category, '
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    Title = apps.get_model('reviews', 'Title')
+    rows = []
+    for title in Title.objects.select_related('category').prefetch_related(
+        'genre'
+    ):
+        category = title.category
+        rows.append((
+            title.pk,
+            title.name,
+            title.description,
+            str(title.year),
+            ' '.join(
+                f'{genre.name} {genre.slug}' for genre in title.genre.all()
+            ),
+            f'{category.name} {category.slug}' if category else '',
+        ))
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            'INSERT INTO reviews_title_search'
+            '(rowid, name, description, year, genres, category) '
+            'VALUES (%s, %s, %s, %s, %s, %s)',
+            rows
+        )
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS reviews_title_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_title_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleSearch',
+            fields=[
+                ('title', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search', serialize=False, to='reviews.title')),
+                ('document', reviews.models.SearchDocumentField(db_column='reviews_title_search')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'reviews_title_search',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def fill_comment_counters(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Comment = apps.get_model('reviews', 'Comment')
+    totals = (
+        Comment.objects.order_by().values('review')
+        .annotate(comments_count=Count('pk'), last_comment_date=Max('pub_date'))
+    )
+    for row in totals:
+        Review.objects.filter(pk=row['review']).update(
+            comments_count=row['comments_count'],
+            last_comment_date=row['last_comment_date']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_titlesearch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество комментариев'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='last_comment_date',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Дата последнего комментария'),
+        ),
+        migrations.RunPython(fill_comment_counters, migrations.RunPython.noop),
+    ]
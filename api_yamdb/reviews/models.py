@@ -1,6 +1,7 @@
 from datetime import datetime
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, Max, Sum
 from django.core.validators import (
     MaxValueValidator, MinValueValidator
 )
@@ -26,6 +27,27 @@ class Genre(models.Model):
     slug = models.SlugField(unique=True, max_length=50)
 
 
+class TitleQuerySet(models.QuerySet):
+    def refresh_ratings(self):
+        """Пересчитывает сохранённые суммы оценок и число отзывов."""
+        titles = list(self.only('pk'))
+        totals = {
+            row['title']: row for row in (
+                Review.objects.filter(title__in=titles).order_by()
+                .values('title')
+                .annotate(score_sum=Sum('score'), reviews_count=Count('pk'))
+            )
+        }
+        for title in titles:
+            row = totals.get(title.pk, {})
+            title.score_sum = row.get('score_sum', 0)
+            title.reviews_count = row.get('reviews_count', 0)
+        self.model.objects.bulk_update(
+            titles, ('score_sum', 'reviews_count')
+        )
+        return len(titles)
+
+
 class Title(models.Model):
     category = models.ForeignKey(
         Category,
@@ -47,6 +69,79 @@ class Title(models.Model):
         verbose_name='Год издания'
     )
     description = models.TextField()
+    score_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок'
+    )
+    reviews_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество отзывов'
+    )
+
+    objects = TitleQuerySet.as_manager()
+
+    @property
+    def rating(self):
+        if not self.reviews_count:
+            return None
+        return self.score_sum // self.reviews_count
+
+
+class SearchDocumentField(models.TextField):
+    """Скрытый столбец FTS5-таблицы с её именем, к нему применяется MATCH."""
+
+
+@SearchDocumentField.register_lookup
+class Match(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+class TitleSearch(models.Model):
+    """Полнотекстовый индекс произведений (виртуальная таблица FTS5)."""
+    title = models.OneToOneField(
+        Title,
+        primary_key=True,
+        db_column='rowid',
+        on_delete=models.DO_NOTHING,
+        related_name='search'
+    )
+    document = SearchDocumentField(db_column='reviews_title_search')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'reviews_title_search'
+
+
+class ReviewQuerySet(models.QuerySet):
+    def refresh_comment_counters(self):
+        """Пересчитывает число комментариев и дату последнего из них."""
+        reviews = list(self.only('pk'))
+        totals = {
+            row['review']: row for row in (
+                Comment.objects.filter(review__in=reviews).order_by()
+                .values('review')
+                .annotate(
+                    comments_count=Count('pk'),
+                    last_comment_date=Max('pub_date')
+                )
+            )
+        }
+        for review in reviews:
+            row = totals.get(review.pk, {})
+            review.comments_count = row.get('comments_count', 0)
+            review.last_comment_date = row.get('last_comment_date')
+        self.model.objects.bulk_update(
+            reviews, ('comments_count', 'last_comment_date')
+        )
+        return len(reviews)
 
 
 class Review(models.Model):
@@ -71,9 +166,32 @@ class Review(models.Model):
             MaxValueValidator(10),
         ],
     )
+    comments_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
+    last_comment_date = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Дата последнего комментария'
+    )
+
+    objects = ReviewQuerySet.as_manager()
 
     class Meta:
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('title', '-pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            ),
+            models.Index(
+                fields=('title', 'score', 'id'),
+                name='review_title_score_idx'
+            ),
+        )
         constraints = (
             models.UniqueConstraint(
                 fields=('title', 'author',),
@@ -84,6 +202,16 @@ class Review(models.Model):
     def __str__(self):
         return self.text[:15]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = dict(zip(field_names, values)).get('score')
+        return instance
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     """Модель комментириев."""
@@ -104,11 +232,38 @@ class Comment(models.Model):
     )
     pub_date = models.DateTimeField(
         verbose_name='Дата добавления',
-        auto_now_add=True,
-        db_index=True
+        auto_now_add=True
     )
 
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ['pub_date']
+        indexes = (
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            ),
+        )
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class ImportedRow(models.Model):
+    """Отпечаток строки CSV, загруженной синхронизацией каталога."""
+    table = models.CharField(max_length=32)
+    row_id = models.BigIntegerField()
+    digest = models.CharField(max_length=32)
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('table', 'row_id'),
+                name='unique_imported_row'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.table}:{self.row_id}'
@@ -0,0 +1,91 @@
+import re
+
+from django.db import connection
+
+from reviews.models import Title, TitleSearch
+
+SEARCH_TABLE = TitleSearch._meta.db_table
+SEARCH_COLUMNS = ('name', 'description', 'year', 'genres', 'category')
+
+
+def is_search_available():
+    return connection.vendor == 'sqlite'
+
+
+def get_search_rows(titles):
+    for title in titles.select_related('category').prefetch_related('genre'):
+        category = title.category
+        yield (
+            title.pk,
+            title.name,
+            title.description,
+            str(title.year),
+            ' '.join(
+                f'{genre.name} {genre.slug}' for genre in title.genre.all()
+            ),
+            f'{category.name} {category.slug}' if category else '',
+        )
+
+
+def index_titles(titles):
+    """Добавляет или обновляет произведения в поисковом индексе."""
+    if not is_search_available():
+        return 0
+    rows = list(get_search_rows(titles))
+    columns = ', '.join(SEARCH_COLUMNS)
+    placeholders = ', '.join(['%s'] * (len(SEARCH_COLUMNS) + 1))
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT OR REPLACE INTO {SEARCH_TABLE}(rowid, {columns}) '
+            f'VALUES ({placeholders})',
+            rows
+        )
+    return len(rows)
+
+
+def remove_titles(title_ids):
+    if not is_search_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s',
+            [(title_id,) for title_id in title_ids]
+        )
+
+
+def rebuild_search_index(chunk_size=1000):
+    """Перестраивает индекс целиком, читая произведения порциями."""
+    if not is_search_available():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+    last_id = 0
+    total = 0
+    while True:
+        ids = list(
+            Title.objects.filter(pk__gt=last_id).order_by('pk')
+            .values_list('pk', flat=True)[:chunk_size]
+        )
+        if not ids:
+            return total
+        total += index_titles(Title.objects.filter(pk__in=ids))
+        last_id = ids[-1]
+
+
+def to_fts_query(text):
+    return ' '.join(f'"{term}"*' for term in re.findall(r'\w+', text))
+
+
+def search_titles(queryset, text):
+    """Произведения, подходящие под запрос, от наиболее релевантных.
+
+    Запрос без слов не фильтрует список, как и `SearchFilter`.
+    """
+    query = to_fts_query(text)
+    if not query:
+        return queryset
+    if not is_search_available():
+        return queryset.filter(name__icontains=text)
+    return queryset.filter(
+        search__document__match=query
+    ).order_by('search__rank')
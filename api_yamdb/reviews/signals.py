@@ -0,0 +1,125 @@
+from django.db.models import F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete
+)
+from django.dispatch import receiver
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.search import index_titles, remove_titles
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, raw, **kwargs):
+    """Обновляет сумму оценок произведения при создании и правке отзыва."""
+    if raw:
+        return
+    if created:
+        Title.objects.filter(pk=instance.title_id).update(
+            score_sum=F('score_sum') + instance.score,
+            reviews_count=F('reviews_count') + 1
+        )
+    elif getattr(instance, '_loaded_score', None) != instance.score:
+        # Разница со старой оценкой расходится при параллельных правках
+        # одного отзыва, поэтому сумма пересчитывается одним UPDATE.
+        score_sum = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title').annotate(
+            score_sum=Sum('score')
+        ).values('score_sum')
+        Title.objects.filter(pk=instance.title_id).update(
+            score_sum=Coalesce(Subquery(score_sum), 0)
+        )
+    instance._loaded_score = instance.score
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    """Вычитает оценку удалённого отзыва, в том числе при каскаде."""
+    Title.objects.filter(pk=instance.title_id).update(
+        score_sum=Greatest(F('score_sum') - instance.score, 0),
+        reviews_count=Greatest(F('reviews_count') - 1, 0)
+    )
+
+
+@receiver(post_save, sender=Comment)
+def update_comment_counters_on_save(sender, instance, created, raw,
+                                    **kwargs):
+    """Учитывает новый комментарий в счётчике и дате отзыва."""
+    if raw or not created:
+        return
+    Review.objects.filter(pk=instance.review_id).update(
+        comments_count=F('comments_count') + 1,
+        last_comment_date=Greatest(
+            Coalesce(F('last_comment_date'), instance.pub_date),
+            instance.pub_date
+        )
+    )
+
+
+@receiver(post_delete, sender=Comment)
+def update_comment_counters_on_delete(sender, instance, **kwargs):
+    latest = Comment.objects.filter(
+        review=OuterRef('pk')
+    ).order_by('-pub_date').values('pub_date')[:1]
+    Review.objects.filter(pk=instance.review_id).update(
+        comments_count=Greatest(F('comments_count') - 1, 0),
+        last_comment_date=Subquery(latest)
+    )
+
+
+@receiver(post_save, sender=Title)
+def index_title(sender, instance, raw, **kwargs):
+    if not raw:
+        index_titles(Title.objects.filter(pk=instance.pk))
+
+
+@receiver(post_delete, sender=Title)
+def unindex_title(sender, instance, **kwargs):
+    remove_titles((instance.pk,))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def index_title_genres(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action.startswith('post_'):
+            index_titles(Title.objects.filter(pk=instance.pk))
+        return
+    if action == 'pre_clear':
+        instance._search_title_ids = list(
+            instance.genres.values_list('pk', flat=True)
+        )
+    elif action == 'post_clear':
+        index_titles(Title.objects.filter(pk__in=instance._search_title_ids))
+    elif action.startswith('post_'):
+        index_titles(Title.objects.filter(pk__in=pk_set))
+
+
+@receiver(pre_delete, sender=Genre)
+def remember_genre_titles(sender, instance, **kwargs):
+    instance._search_title_ids = list(
+        instance.genres.values_list('pk', flat=True)
+    )
+
+
+@receiver(pre_delete, sender=Category)
+def remember_category_titles(sender, instance, **kwargs):
+    instance._search_title_ids = list(
+        instance.titles.values_list('pk', flat=True)
+    )
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Category)
+def reindex_renamed(sender, instance, created, raw, **kwargs):
+    """Переиндексирует произведения при переименовании жанра/категории."""
+    if created or raw:
+        return
+    related = instance.genres if sender is Genre else instance.titles
+    index_titles(related.all())
+
+
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Category)
+def reindex_after_delete(sender, instance, **kwargs):
+    index_titles(Title.objects.filter(pk__in=instance._search_title_ids))
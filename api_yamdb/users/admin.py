@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import User
+from .models import OutgoingMail, User
 
 
 class UserAdmin(admin.ModelAdmin):
@@ -19,3 +19,19 @@ class UserAdmin(admin.ModelAdmin):
 
 
 admin.site.register(User, UserAdmin)
+
+
+class OutgoingMailAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'recipient',
+        'subject',
+        'attempts',
+        'next_attempt',
+        'last_error'
+    )
+    search_fields = ('recipient',)
+    empty_value_display = '-пусто-'
+
+
+admin.site.register(OutgoingMail, OutgoingMailAdmin)
@@ -0,0 +1,129 @@
+from datetime import timedelta
+from threading import Lock
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutgoingMail
+
+_stats_lock = Lock()
+_mail_stats = {'sent': 0, 'failed': 0, 'dropped': 0}
+
+
+def record_mail_stats(**counts):
+    with _stats_lock:
+        for name, count in counts.items():
+            _mail_stats[name] += count
+
+
+def get_mail_stats():
+    """Счётчики отправленных, неудачных и отброшенных писем процесса."""
+    with _stats_lock:
+        stats = dict(_mail_stats)
+    stats['pending'] = get_pending_mail().count()
+    return stats
+
+
+def reset_mail_stats():
+    with _stats_lock:
+        for name in _mail_stats:
+            _mail_stats[name] = 0
+
+
+def get_pending_mail(now=None):
+    return OutgoingMail.objects.filter(
+        attempts__lt=settings.MAIL_QUEUE_MAX_ATTEMPTS,
+        next_attempt__lte=now or timezone.now()
+    )
+
+
+def get_retry_delay(attempts):
+    """Экспоненциальная задержка: 1, 2, 4... базовых интервала."""
+    return timedelta(
+        seconds=settings.MAIL_QUEUE_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def enqueue_mail(subject, body, recipient, from_email=None):
+    """Ставит письмо в очередь вместо отправки на пути запроса."""
+    mail = OutgoingMail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=from_email or settings.EMAIL_FOR_AUTH_LETTERS,
+        recipient=recipient
+    )
+    if settings.MAIL_QUEUE_EAGER:
+        transaction.on_commit(lambda: send_queued_mail([mail]))
+    return mail
+
+
+def claim_mail(batch_size):
+    """Забирает пачку писем, сдвигая их следующую попытку на время
+    обработки, чтобы параллельный обработчик их не взял."""
+    now = timezone.now()
+    ids = list(get_pending_mail(now).values_list('pk', flat=True)[:batch_size])
+    if not ids:
+        return []
+    lease = now + get_retry_delay(1)
+    get_pending_mail(now).filter(pk__in=ids).update(next_attempt=lease)
+    return list(OutgoingMail.objects.filter(pk__in=ids, next_attempt=lease))
+
+
+def send_queued_mail(messages, connection=None):
+    """Отправляет письма через одно соединение; возвращает число
+    доставленных."""
+    if not messages:
+        return 0
+    connection = connection or get_connection()
+    sent, failed = [], []
+    try:
+        connection.open()
+    except Exception as error:
+        failed = [(mail, error) for mail in messages]
+    else:
+        try:
+            for mail in messages:
+                try:
+                    connection.send_messages([EmailMessage(
+                        mail.subject, mail.body, mail.from_email,
+                        [mail.recipient], connection=connection
+                    )])
+                except Exception as error:
+                    failed.append((mail, error))
+                else:
+                    sent.append(mail.pk)
+        finally:
+            connection.close()
+    OutgoingMail.objects.filter(pk__in=sent).delete()
+    now = timezone.now()
+    for mail, error in failed:
+        mail.attempts += 1
+        mail.next_attempt = now + get_retry_delay(mail.attempts)
+        mail.last_error = f'{type(error).__name__}: {error}'
+    OutgoingMail.objects.bulk_update(
+        [mail for mail, _ in failed],
+        ('attempts', 'next_attempt', 'last_error')
+    )
+    record_mail_stats(
+        sent=len(sent),
+        failed=len(failed),
+        dropped=sum(
+            mail.attempts >= settings.MAIL_QUEUE_MAX_ATTEMPTS
+            for mail, _ in failed
+        )
+    )
+    return len(sent)
+
+
+def process_mail_queue(batch_size=None):
+    """Разбирает очередь пачками, пока в ней есть готовые к отправке
+    письма."""
+    batch_size = batch_size or settings.MAIL_QUEUE_BATCH_SIZE
+    total = 0
+    while True:
+        batch = claim_mail(batch_size)
+        if not batch:
+            return total
+        total += send_queued_mail(batch)
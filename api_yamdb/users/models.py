@@ -1,6 +1,7 @@
 from django.db import models
 from django.core.validators import RegexValidator
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 
 from django.conf import settings
 from .validators import validate_email
@@ -44,3 +45,21 @@ class User(AbstractUser):
 
     def __str__(self) -> str:
         return self.username
+
+
+class OutgoingMail(models.Model):
+    """Письмо в очереди на отправку; после доставки строка удаляется."""
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.EmailField(max_length=254)
+    recipient = models.EmailField(max_length=254)
+    created = models.DateTimeField(auto_now_add=True)
+    next_attempt = models.DateTimeField(default=timezone.now, db_index=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ('next_attempt', 'id')
+
+    def __str__(self) -> str:
+        return f'{self.recipient}: {self.subject}'
@@ -0,0 +1,24 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(scope='session', autouse=True)
+def cache_location(tmp_path_factory):
+    from django.conf import settings
+    from django.test import override_settings
+
+    caches = {
+        alias: {
+            **params, 'LOCATION': str(tmp_path_factory.mktemp('cache'))
+        }
+        for alias, params in settings.CACHES.items()
+    }
+    with override_settings(CACHES=caches):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(cache_location):
+    cache.clear()
+    yield
+    cache.clear()
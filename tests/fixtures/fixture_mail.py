@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def eager_mail_queue(settings):
+    from users.mail import reset_mail_stats
+
+    settings.MAIL_QUEUE_EAGER = True
+    reset_mail_stats()
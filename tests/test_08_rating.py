@@ -0,0 +1,91 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_review, create_titles
+
+
+def get_rating(client, title_id):
+    response = client.get(f'/api/v1/titles/{title_id}/')
+    assert response.status_code == HTTPStatus.OK
+    return response.json().get('rating')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08RatingAggregates:
+
+    def test_01_rating_follows_review_changes(self, admin_client, user_client,
+                                              moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Плохо', 2)
+        response = create_single_review(
+            moderator_client, title_id, 'Хорошо', 8
+        )
+        assert get_rating(admin_client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения равен средней оценке '
+            'отзывов после их создания.'
+        )
+
+        review_id = response.json()['id']
+        url = f'/api/v1/titles/{title_id}/reviews/{review_id}/'
+        moderator_client.patch(url, data={'score': 10})
+        assert get_rating(admin_client, title_id) == 6, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'изменении оценки отзыва.'
+        )
+
+        moderator_client.delete(url)
+        assert get_rating(admin_client, title_id) == 2, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'удалении отзыва.'
+        )
+
+    def test_02_rating_follows_cascade_delete(self, admin_client, user,
+                                              user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Плохо', 1)
+        create_single_review(moderator_client, title_id, 'Хорошо', 9)
+
+        user.delete()
+        assert get_rating(admin_client, title_id) == 9, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'каскадном удалении отзывов вместе с автором.'
+        )
+
+    def test_03_recompute_ratings_command(self, admin_client, user_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Нормально', 7)
+        Title.objects.update(score_sum=0, reviews_count=0)
+        assert get_rating(admin_client, title_id) is None
+
+        call_command('recompute_ratings', chunk_size=1)
+        assert get_rating(admin_client, title_id) == 7, (
+            'Проверьте, что команда `recompute_ratings` восстанавливает '
+            'сохранённый рейтинг произведений.'
+        )
+
+    def test_04_concurrent_score_updates(self, admin_client, user_client):
+        from reviews.models import Review, Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review_id = create_single_review(
+            user_client, title_id, 'Нормально', 5
+        ).json()['id']
+        first = Review.objects.get(pk=review_id)
+        second = Review.objects.get(pk=review_id)
+        first.score = 7
+        first.save()
+        second.score = 9
+        second.save()
+        assert Title.objects.get(pk=title_id).score_sum == 9, (
+            'Проверьте, что при параллельной правке оценки одного отзыва '
+            'сумма оценок произведения пересчитывается, а не сдвигается '
+            'на разницу со старой оценкой.'
+        )
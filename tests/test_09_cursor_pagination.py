@@ -0,0 +1,216 @@
+import json
+from base64 import urlsafe_b64encode
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def make_cursor(position, reverse=False):
+    data = json.dumps({'p': position, 'r': int(reverse)})
+    return urlsafe_b64encode(data.encode()).decode()
+
+
+def collect_pages(client, url):
+    results = []
+    pages = 0
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что в режиме `?cursor=` ответ не содержит `count`.'
+        )
+        results.extend(data['results'])
+        url = data['next']
+        pages += 1
+    return results, pages
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09CursorPagination:
+
+    def test_01_titles_cursor(self, client):
+        from reviews.models import Title
+
+        for idx in range(25):
+            Title.objects.create(
+                name=f'Произведение {idx % 7}', year=2000, description=''
+            )
+        expected = list(
+            Title.objects.order_by('name', 'id').values_list('id', flat=True)
+        )
+
+        results, pages = collect_pages(client, '/api/v1/titles/?cursor=')
+        assert [title['id'] for title in results] == expected, (
+            'Проверьте, что `?cursor=` для `/api/v1/titles/` обходит все '
+            'произведения в порядке `(name, id)` без пропусков и повторов.'
+        )
+        assert pages == 3
+
+        url = client.get('/api/v1/titles/?cursor=').json()['next']
+        last_page = client.get(client.get(url).json()['next']).json()
+        assert last_page['next'] is None
+        url = last_page['previous']
+        results = []
+        while url:
+            data = client.get(url).json()
+            results = data['results'] + results
+            url = data['previous']
+        assert [title['id'] for title in results] == expected[:20], (
+            'Проверьте, что ссылки `previous` в режиме `?cursor=` ведут '
+            'на предыдущие страницы.'
+        )
+
+        response = client.get('/api/v1/titles/')
+        assert response.json()['count'] == 25, (
+            'Проверьте, что без `?cursor=` сохраняется пагинация со '
+            'смещением.'
+        )
+
+    def test_02_reviews_and_comments_cursor(self, client, admin,
+                                            django_user_model):
+        from reviews.models import Comment, Review, Title
+
+        title = Title.objects.create(name='Фильм', year=2000, description='')
+        for idx in range(23):
+            author = django_user_model.objects.create_user(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                title=title, author=author, text=f'{idx}', score=5
+            )
+        review = Review.objects.first()
+        for idx in range(12):
+            Comment.objects.create(review=review, author=admin, text=f'{idx}')
+        review_ids = sorted(Review.objects.values_list('id', flat=True))
+        Review.objects.filter(pk__in=review_ids[:10]).update(
+            pub_date=Review.objects.get(pk=review_ids[10]).pub_date
+        )
+
+        expected = list(
+            Review.objects.order_by('-pub_date', 'id')
+            .values_list('id', flat=True)
+        )
+        url = f'/api/v1/titles/{title.id}/reviews/?cursor='
+        with CaptureQueriesContext(connection) as context:
+            results, _ = collect_pages(client, url)
+        assert [review['id'] for review in results] == expected, (
+            'Проверьте, что `?cursor=` для отзывов обходит их в порядке '
+            '`(-pub_date, id)` без пропусков и повторов.'
+        )
+        assert not any(
+            'COUNT(' in query['sql'] for query in context.captured_queries
+        ), 'Проверьте, что в режиме `?cursor=` не выполняется COUNT(*).'
+
+        expected = list(
+            review.comments.order_by('pub_date', 'id')
+            .values_list('id', flat=True)
+        )
+        url = (
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/?cursor='
+        )
+        results, _ = collect_pages(client, url)
+        assert [comment['id'] for comment in results] == expected
+
+        response = client.get(url + 'broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    @pytest.mark.parametrize('url,position', (
+        ('/api/v1/titles/', ['t01', 'x']),
+        ('/api/v1/titles/', ['t01', 2 ** 70]),
+        ('/api/v1/titles/', ['t01', None]),
+        ('/api/v1/titles/{title_id}/reviews/', [None, 1]),
+        ('/api/v1/titles/{title_id}/reviews/', ['не дата', 1]),
+        ('/api/v1/titles/{title_id}/reviews/', [
+            '2020-01-01T00:00:00+00:00', [1]
+        ]),
+    ))
+    def test_03_tampered_cursor(self, client, url, position):
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Фильм', year=2000, description='')
+        url = url.format(title_id=title.pk)
+        response = client.get(f'{url}?cursor={make_cursor(position)}')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'Проверьте, что подделанный cursor для `{url}` возвращает '
+            'ошибку 404, а не 500.'
+        )
+        assert response.json() == {'detail': 'Некорректный cursor.'}
+
+    @pytest.mark.parametrize('ordering,expected_ordering', (
+        ('score', ('score', 'id')),
+        ('-score', ('-score', '-id')),
+        ('pub_date', ('pub_date', '-id')),
+        ('-comments_count', ('-comments_count', 'id')),
+    ))
+    def test_04_reviews_cursor_with_ordering(self, client, django_user_model,
+                                             ordering, expected_ordering):
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Фильм', year=2000, description='')
+        for idx in range(23):
+            author = django_user_model.objects.create_user(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                title=title, author=author, text=f'{idx}',
+                score=idx % 4 + 1
+            )
+        expected = list(
+            Review.objects.order_by(*expected_ordering)
+            .values_list('id', flat=True)
+        )
+        url = f'/api/v1/titles/{title.id}/reviews/?ordering={ordering}&cursor='
+        results, _ = collect_pages(client, url)
+        assert [review['id'] for review in results] == expected, (
+            f'Проверьте, что `?cursor=` с `?ordering={ordering}` обходит '
+            f'отзывы в порядке `{expected_ordering}` без пропусков и '
+            'повторов.'
+        )
+
+    def test_05_cursor_with_nullable_ordering(self, client):
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Фильм', year=2000, description='')
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = client.get(f'{url}?ordering=last_comment_date&cursor=')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что `?cursor=` вместе с сортировкой по полю, '
+            'допускающему NULL, возвращает ошибку 400.'
+        )
+        assert 'ordering' in response.json()
+        response = client.get(f'{url}?ordering=last_comment_date')
+        assert response.status_code == HTTPStatus.OK
+
+    def test_06_titles_cursor_limit_and_search(self, client):
+        from reviews.models import Title
+
+        for idx in range(7):
+            Title.objects.create(
+                name=f'Произведение {idx}', year=2000, description=''
+            )
+        expected = list(
+            Title.objects.order_by('name', 'id').values_list('id', flat=True)
+        )
+        results, pages = collect_pages(
+            client, '/api/v1/titles/?limit=3&cursor='
+        )
+        assert [title['id'] for title in results] == expected
+        assert pages == 3, (
+            'Проверьте, что в режиме `?cursor=` для `/api/v1/titles/` '
+            'учитывается `?limit=`.'
+        )
+
+        response = client.get('/api/v1/titles/?q=произведение&cursor=')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что `?cursor=` вместе с ранжированным поиском `?q=` '
+            'возвращает ошибку 400, а не меняет порядок результатов.'
+        )
+        assert 'q' in response.json()
+        results, _ = collect_pages(client, '/api/v1/titles/?search=&cursor=')
+        assert len(results) == 7
@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# COUNT(*) для пагинации, страница произведений с категориями, жанры.
+TITLE_LIST_QUERY_BUDGET = 3
+
+
+def create_catalog(size):
+    from reviews.models import Category, Genre, Title
+
+    category = Category.objects.create(name='Фильм', slug='films')
+    genres = [
+        Genre.objects.create(name='Драма', slug='drama'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {idx}', year=2000, description='',
+              category=category)
+        for idx in range(size)
+    )
+    Title.genre.through.objects.bulk_create(
+        Title.genre.through(title_id=title_id, genre=genre)
+        for title_id in Title.objects.values_list('id', flat=True)
+        for genre in genres
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10TitleQueries:
+
+    @pytest.mark.parametrize('size', (10, 100, 1000))
+    def test_01_title_list_query_budget(self, client, size):
+        create_catalog(size)
+
+        url = f'/api/v1/titles/?limit={size}'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert len(data['results']) == size
+        assert len(data['results'][0]['genre']) == 2
+        assert data['results'][0]['category']['slug'] == 'films'
+        assert len(context.captured_queries) <= TITLE_LIST_QUERY_BUDGET, (
+            f'Проверьте, что GET-запрос к `{url}` выполняет не больше '
+            f'{TITLE_LIST_QUERY_BUDGET} запросов к базе данных независимо '
+            'от размера страницы.'
+        )
+        assert not any(
+            'reviews_review' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что список произведений не загружает отзывы.'
+        )
+
+    def test_02_title_detail_query_budget(self, client):
+        create_catalog(1)
+        from reviews.models import Title
+
+        title = Title.objects.get()
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'/api/v1/titles/{title.id}/')
+        assert response.status_code == HTTPStatus.OK
+        assert len(context.captured_queries) <= 2, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/{title_id}/` '
+            'загружает категорию и жанры не больше чем двумя запросами.'
+        )
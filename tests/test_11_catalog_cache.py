@@ -0,0 +1,147 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.fixture
+def cache_stats():
+    from api.cache import get_cache_stats, reset_cache_stats
+
+    reset_cache_stats()
+    yield get_cache_stats
+    reset_cache_stats()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11CatalogCache:
+
+    def check_cached(self, client, url):
+        first = client.get(url)
+        assert first.status_code == HTTPStatus.OK
+        with CaptureQueriesContext(connection) as context:
+            second = client.get(url)
+        assert second.json() == first.json()
+        assert not context.captured_queries, (
+            f'Проверьте, что повторный GET-запрос к `{url}` отдаётся из '
+            'кэша без запросов к базе данных.'
+        )
+        return second.json()
+
+    def test_01_catalog_hits_and_invalidation(self, client, admin_client,
+                                              cache_stats):
+        titles, _, _ = create_titles(admin_client)
+        for url in ('/api/v1/titles/', '/api/v1/genres/',
+                    '/api/v1/categories/'):
+            self.check_cached(client, url)
+        stats = cache_stats()
+        for resource in ('titles', 'genres', 'categories'):
+            assert stats[resource] == {'hits': 1, 'misses': 1}
+
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Вестерн', 'slug': 'western'}
+        )
+        data = self.check_cached(client, '/api/v1/genres/')
+        assert data['count'] == 4, (
+            'Проверьте, что изменение жанров сбрасывает кэш `/api/v1/genres/`.'
+        )
+
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'genre': 'western'}
+        )
+        data = self.check_cached(client, f'/api/v1/titles/{titles[0]["id"]}/')
+        assert data['genre'] == [{'name': 'Вестерн', 'slug': 'western'}], (
+            'Проверьте, что изменение жанров произведения сбрасывает кэш.'
+        )
+
+    def test_02_review_invalidates_rating(self, client, admin_client,
+                                          user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert self.check_cached(client, url)['rating'] is None
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 9)
+        assert self.check_cached(client, url)['rating'] == 9, (
+            'Проверьте, что новый отзыв сбрасывает кэш произведений.'
+        )
+
+    def test_03_query_string_in_key(self, client, admin_client):
+        create_titles(admin_client)
+        first = self.check_cached(client, '/api/v1/titles/?limit=1')
+        second = self.check_cached(client, '/api/v1/titles/?limit=2')
+        assert len(first['results']) == 1 and len(second['results']) == 2
+
+    def test_04_file_backend(self, client, admin_client, tmp_path):
+        caches = {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.'
+                           'FileBasedCache',
+                'LOCATION': str(tmp_path),
+            }
+        }
+        with override_settings(CACHES=caches):
+            create_titles(admin_client)
+            data = self.check_cached(client, '/api/v1/categories/')
+            assert data['count'] == 2
+            admin_client.delete('/api/v1/categories/books/')
+            data = self.check_cached(client, '/api/v1/categories/')
+            assert data['count'] == 1
+
+    def test_05_default_cache_shared(self):
+        from django.conf import settings
+        from django.core.cache import caches
+
+        from api.cache import (
+            bump_catalog_version, get_catalog_version, get_version_key
+        )
+
+        assert 'LocMemCache' not in settings.CACHES['default']['BACKEND'], (
+            'Проверьте, что кэш по умолчанию общий для процессов сервера: '
+            'версии каталога в LocMemCache у каждого процесса свои.'
+        )
+        version = get_catalog_version('titles')
+        other_process_cache = caches.create_connection('default')
+        bump_catalog_version('titles')
+        assert other_process_cache.get(get_version_key('titles')) not in (
+            None, version
+        )
+
+    def test_06_version_bumped_after_commit(self):
+        from django.db import transaction
+
+        from api.cache import get_catalog_version
+        from reviews.models import Genre
+
+        version = get_catalog_version('genres')
+        with transaction.atomic():
+            Genre.objects.create(name='Вестерн', slug='western')
+            assert get_catalog_version('genres') == version, (
+                'Проверьте, что версия ресурса меняется только после '
+                'фиксации транзакции, иначе параллельный запрос закэширует '
+                'старые данные под новой версией.'
+            )
+        assert get_catalog_version('genres') != version
+
+    def test_07_stats_shared_between_processes(self, client, admin_client,
+                                               cache_stats):
+        from django.core.cache import caches
+        from django.core.management import call_command
+
+        from api.cache import record_cache_access
+
+        create_titles(admin_client)
+        self.check_cached(client, '/api/v1/genres/')
+        other_process_cache = caches.create_connection('default')
+        assert other_process_cache.get('catalog:stats:genres:hits') == 1, (
+            'Проверьте, что счётчики кэша хранятся в общем кэше, а не в '
+            'памяти процесса.'
+        )
+        record_cache_access('genres', hit=True)
+        out = StringIO()
+        call_command('catalog_cache_stats', '--reset', stdout=out)
+        assert 'genres: попаданий 2, промахов 1' in out.getvalue()
+        assert cache_stats()['genres'] == {'hits': 0, 'misses': 0}
@@ -0,0 +1,138 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_single_review, create_titles
+
+
+def get_last_modified(client, url):
+    """Last-Modified отдаётся со следующей целой секунды после изменения.
+
+    Первый запрос заводит версии ресурсов, которых ещё нет в кэше.
+    """
+    client.get(url)
+    time.sleep(1 - time.time() % 1 + 0.01)
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert response.has_header('Last-Modified'), (
+        f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+        '`Last-Modified`.'
+    )
+    return response['Last-Modified']
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ConditionalGet:
+
+    def check_not_modified(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response['ETag']
+        assert etag.startswith('W/"'), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит слабый '
+            'ETag.'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert not context.captured_queries, (
+            f'Проверьте, что ответ 304 для `{url}` не обращается к базе '
+            'данных.'
+        )
+        return etag
+
+    def test_01_conditional_get(self, client, admin_client, admin,
+                                user_client, user, moderator_client,
+                                moderator):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        title_id = titles[0]['id']
+        review_id = reviews[0]['id']
+        urls = {
+            'title': f'/api/v1/titles/{title_id}/',
+            'reviews': f'/api/v1/titles/{title_id}/reviews/',
+            'comments': (
+                f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+            ),
+        }
+        etags = {
+            name: self.check_not_modified(client, url)
+            for name, url in urls.items()
+        }
+
+        last_modified = get_last_modified(client, urls['reviews'])
+        response = client.get(
+            urls['reviews'], HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        create_single_review(moderator_client, title_id, 'Новый отзыв', 1)
+        for name in ('title', 'reviews'):
+            response = client.get(urls[name], HTTP_IF_NONE_MATCH=etags[name])
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что новый отзыв меняет ETag `{urls[name]}`.'
+            )
+        response = client.get(
+            urls['comments'], HTTP_IF_NONE_MATCH=etags['comments']
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        user_client.patch(
+            f'{urls["comments"]}{comments[1]["id"]}/', data={'text': 'Ой'}
+        )
+        response = client.get(
+            urls['comments'], HTTP_IF_NONE_MATCH=etags['comments']
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение комментария меняет ETag списка '
+            'комментариев.'
+        )
+
+    def test_02_missing_title(self, client):
+        response = client.get('/api/v1/titles/999/reviews/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert not response.has_header('ETag')
+
+    def test_03_last_modified_follows_edits(self, client, admin_client,
+                                            user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        create_single_review(user_client, titles[0]['id'], 'Старый', 5)
+        review_id = create_single_review(
+            moderator_client, titles[0]['id'], 'Новый', 5
+        ).json()['id']
+
+        for change in (
+            lambda: moderator_client.patch(
+                f'{url}{review_id}/', data={'score': 1}
+            ),
+            lambda: moderator_client.delete(f'{url}{review_id}/'),
+        ):
+            last_modified = get_last_modified(client, url)
+            change()
+            for _ in range(2):
+                response = client.get(
+                    url, HTTP_IF_MODIFIED_SINCE=last_modified
+                )
+                assert response.status_code == HTTPStatus.OK, (
+                    f'Проверьте, что правка и удаление отзыва сдвигают '
+                    f'`Last-Modified` списка `{url}`.'
+                )
+                time.sleep(1 - time.time() % 1 + 0.01)
+
+    def test_04_deleted_title_etag(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = client.get(url)['ETag']
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что после удаления произведения старый ETag списка '
+            'его отзывов не даёт ответ 304.'
+        )
@@ -0,0 +1,88 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_titles
+
+
+def search(client, query, param='q'):
+    response = client.get('/api/v1/titles/', {param: query})
+    assert response.status_code == HTTPStatus.OK
+    return [title['name'] for title in response.json()['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitleSearch:
+
+    def test_01_search_by_fields(self, client, admin_client):
+        create_titles(admin_client)
+        assert search(client, 'терминат') == ['Терминатор'], (
+            'Проверьте, что `?q=` находит произведение по началу названия.'
+        )
+        assert search(client, 'drama') == ['Крепкий орешек'], (
+            'Проверьте, что `?q=` находит произведение по жанру.'
+        )
+        assert search(client, 'Книги') == ['Крепкий орешек'], (
+            'Проверьте, что `?q=` находит произведение по категории.'
+        )
+        assert search(client, 'horror comedy') == ['Терминатор'], (
+            'Проверьте, что поиск не дублирует произведения с несколькими '
+            'жанрами.'
+        )
+        assert search(client, '1988', param='search') == ['Крепкий орешек']
+        for query, param in (('', 'search'), ('', 'q'), ('!!!', 'q')):
+            assert len(search(client, query, param=param)) == 2, (
+                f'Проверьте, что `?{param}={query}` без слов возвращает '
+                'полный список произведений.'
+            )
+
+    def test_02_ranking(self, client, admin_client):
+        admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'}
+        )
+        for name, description in (('Чужие', 'Продолжение фильма Чужой'),
+                                  ('Чужой', 'Чужой на корабле, Чужой')):
+            admin_client.post('/api/v1/titles/', data={
+                'name': name, 'year': 1986, 'category': 'films',
+                'description': description
+            })
+        assert search(client, 'чужой') == ['Чужой', 'Чужие'], (
+            'Проверьте, что результаты `?q=` отсортированы по релевантности.'
+        )
+
+    def test_03_index_sync(self, client, admin_client):
+        from reviews.models import Genre
+
+        titles, _, _ = create_titles(admin_client)
+        genre = Genre.objects.get(slug='drama')
+        genre.name = 'Боевик'
+        genre.save()
+        assert search(client, 'боевик') == ['Крепкий орешек'], (
+            'Проверьте, что индекс обновляется при переименовании жанра.'
+        )
+
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Робокоп'}
+        )
+        assert search(client, 'терминатор') == []
+        assert search(client, 'робокоп') == ['Робокоп']
+
+        admin_client.delete('/api/v1/categories/books/')
+        assert search(client, 'книги') == []
+
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        assert search(client, 'орешек') == []
+
+    def test_04_rebuild_command(self, client, admin_client):
+        from django.db import connection
+
+        create_titles(admin_client)
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM reviews_title_search')
+        assert search(client, 'терминатор') == []
+        call_command('rebuild_title_search', chunk_size=1)
+        assert search(client, 'терминатор') == ['Терминатор'], (
+            'Проверьте, что команда `rebuild_title_search` восстанавливает '
+            'поисковый индекс.'
+        )
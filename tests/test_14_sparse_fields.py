@@ -0,0 +1,84 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14SparseFields:
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return response.json(), [
+            query['sql'] for query in context.captured_queries
+        ]
+
+    def test_01_title_fields(self, client, admin_client, admin, user_client,
+                             user):
+        author_map = {admin: admin_client, user: user_client}
+        create_comments(admin_client, author_map)
+
+        data, queries = self.get(client, '/api/v1/titles/?fields=id,name,rating')
+        assert set(data['results'][0]) == {'id', 'name', 'rating'}, (
+            'Проверьте, что `?fields=` оставляет в ответе `/api/v1/titles/` '
+            'только перечисленные поля.'
+        )
+        assert data['results'][1]['rating'] == 5
+        assert not any(
+            'reviews_category' in sql or 'reviews_genre' in sql
+            or '"description"' in sql for sql in queries
+        ), (
+            'Проверьте, что поля, не попавшие в `?fields=`, не загружаются '
+            'из базы данных.'
+        )
+
+        data, queries = self.get(
+            client, '/api/v1/titles/?omit=genre,description'
+        )
+        assert set(data['results'][0]) == {
+            'id', 'name', 'year', 'rating', 'category'
+        }
+        assert not any('reviews_genre' in sql for sql in queries)
+
+    def test_02_review_comment_user_fields(self, client, admin_client, admin,
+                                           user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+
+        data, queries = self.get(client, f'{url}?omit=text')
+        assert 'text' not in data['results'][0]
+        assert not any('"text"' in sql for sql in queries), (
+            'Проверьте, что `?omit=text` не загружает текст отзывов.'
+        )
+
+        data, queries = self.get(client, f'{url}?omit=author')
+        assert 'author' not in data['results'][0]
+        assert not any('"users_user"' in sql for sql in queries), (
+            'Проверьте, что `?omit=author` не присоединяет таблицу '
+            'пользователей к запросу отзывов.'
+        )
+
+        data, queries = self.get(
+            client, f'{url}{reviews[0]["id"]}/comments/?fields=id,text'
+        )
+        assert set(data['results'][0]) == {'id', 'text'}
+        assert not any('"users_user"' in sql for sql in queries)
+
+        data, _ = self.get(admin_client, '/api/v1/users/?fields=username,role')
+        assert set(data['results'][0]) == {'username', 'role'}
+
+        response = user_client.patch(
+            f'{url}{reviews[1]["id"]}/?fields=id', data={'score': 3}
+        )
+        assert response.json()['score'] == 3, (
+            'Проверьте, что `?fields=` не влияет на изменяющие запросы.'
+        )
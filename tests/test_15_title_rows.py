@@ -0,0 +1,85 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from rest_framework.renderers import JSONRenderer
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TitleRowSerializer:
+
+    def render_both(self, fields):
+        from api.serializers import TitleRowSerializer, TitleSerializer
+        from reviews.models import Title
+
+        queryset = Title.objects.order_by('name')
+        model_data = TitleSerializer(
+            queryset.select_related('category').prefetch_related('genre'),
+            many=True
+        ).data
+        model_data = [
+            {field: title[field] for field in title if field in fields}
+            for title in model_data
+        ]
+        row_data = TitleRowSerializer(
+            queryset.values(*TitleRowSerializer.get_columns(fields)),
+            fields=fields
+        ).data
+        renderer = JSONRenderer()
+        return renderer.render(model_data), renderer.render(row_data)
+
+    def test_01_byte_identical(self, admin_client, user_client,
+                               moderator_client):
+        from api.serializers import TitleSerializer
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Так себе', 4)
+        create_single_review(moderator_client, titles[0]['id'], 'Хорошо', 7)
+        Title.objects.create(name='Без категории', year=2001, description='')
+
+        for fields in (TitleSerializer.Meta.fields, ('id', 'name', 'rating'),
+                       ('category', 'genre')):
+            model_json, row_json = self.render_both(fields)
+            assert model_json == row_json, (
+                'Проверьте, что `TitleRowSerializer` формирует тот же JSON, '
+                'что и `TitleSerializer`.'
+            )
+
+    def test_02_list_uses_rows(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get('/api/v1/titles/')
+        detail = client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.json()['results'][1] == detail.json(), (
+            'Проверьте, что элементы списка `/api/v1/titles/` совпадают с '
+            'ответом `/api/v1/titles/{title_id}/`.'
+        )
+
+    def test_03_benchmark_command(self):
+        out = StringIO()
+        call_command('bench_title_list', rows=20, repeat=1, stdout=out)
+        assert 'TitleRowSerializer' in out.getvalue()
+
+    def test_04_cursor_with_sparse_fields(self, client):
+        from reviews.models import Title
+
+        for idx in range(12):
+            Title.objects.create(
+                name=f'Произведение {idx % 4}', year=2000, description=''
+            )
+        url = '/api/v1/titles/?cursor=&fields=name'
+        names = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == 200, (
+                'Проверьте, что `?cursor=` работает вместе с `?fields=`.'
+            )
+            data = response.json()
+            assert all(set(title) == {'name'} for title in data['results'])
+            names.extend(title['name'] for title in data['results'])
+            url = data['next']
+        assert names == list(
+            Title.objects.order_by('name', 'id').values_list('name', flat=True)
+        )
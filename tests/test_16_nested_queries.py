@@ -0,0 +1,64 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+def post(client, url, data):
+    with CaptureQueriesContext(connection) as context:
+        response = client.post(url, data=data)
+    return response, [query['sql'] for query in context.captured_queries]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16NestedQueries:
+
+    def test_01_review_post_queries(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response, queries = post(user_client, url, {'text': 'Да', 'score': 5})
+        assert response.status_code == HTTPStatus.CREATED
+        title_lookups = [
+            sql for sql in queries
+            if sql.startswith('SELECT') and 'FROM "reviews_title"' in sql
+        ]
+        assert len(title_lookups) == 1, (
+            'Проверьте, что POST-запрос к `/api/v1/titles/{title_id}/reviews/`'
+            ' загружает произведение один раз.'
+        )
+        # Пользователь, произведение, BEGIN, INSERT, обновление рейтинга.
+        assert len(queries) == 5, (
+            'Проверьте количество запросов при создании отзыва.'
+        )
+
+    def test_02_comment_post_queries(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        review = create_single_review(
+            user_client, titles[0]['id'], 'Да', 5
+        ).json()
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{review["id"]}'
+            '/comments/'
+        )
+        response, queries = post(user_client, url, {'text': 'Нет'})
+        assert response.status_code == HTTPStatus.CREATED
+        # Пользователь, отзыв вместе с проверкой произведения, BEGIN, INSERT,
+        # обновление счётчика комментариев.
+        assert len(queries) == 5, (
+            'Проверьте, что POST-запрос к `/api/v1/titles/{title_id}/reviews/'
+            '{review_id}/comments/` загружает отзыв один раз.'
+        )
+
+        wrong_url = (
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/{review["id"]}'
+            '/comments/'
+        )
+        response = user_client.post(wrong_url, data={'text': 'Нет'})
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        response = user_client.get(wrong_url)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что отзыв из URL должен принадлежать произведению.'
+        )
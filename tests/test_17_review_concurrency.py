@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from threading import Barrier
+
+import pytest
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from tests.utils import create_titles
+
+THREADS = 8
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17ReviewConcurrency:
+
+    def test_01_duplicate_review_single_query_less(self, admin_client,
+                                                   user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'Да', 'score': 5})
+        assert response.status_code == HTTPStatus.CREATED
+        assert not any(
+            'SELECT (1) AS "a" FROM "reviews_review"' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что перед созданием отзыва не выполняется отдельная '
+            'проверка уникальности.'
+        )
+
+        response = user_client.post(url, data={'text': 'Ещё', 'score': 1})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {
+            'non_field_errors': ['Вы можете добавить только один отзыв']
+        }, (
+            'Проверьте, что повторный отзыв возвращает прежнюю ошибку 400.'
+        )
+
+    def test_02_parallel_duplicate_posts(self, admin_client, token_user):
+        from reviews.models import Review, Title
+
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        barrier = Barrier(THREADS)
+
+        def post(idx):
+            client = APIClient()
+            client.credentials(
+                HTTP_AUTHORIZATION=f'Bearer {token_user["access"]}'
+            )
+            barrier.wait()
+            try:
+                return client.post(
+                    url, data={'text': f'Отзыв {idx}', 'score': 5}
+                ).status_code
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            statuses = list(executor.map(post, range(THREADS)))
+
+        assert statuses.count(HTTPStatus.CREATED) == 1, (
+            'Проверьте, что из параллельных одинаковых POST-запросов '
+            'успешен только один.'
+        )
+        assert statuses.count(HTTPStatus.BAD_REQUEST) == THREADS - 1, (
+            'Проверьте, что остальные параллельные POST-запросы получают '
+            f'ответ 400, а не ошибку сервера: {statuses}.'
+        )
+        assert Review.objects.count() == 1
+        assert Title.objects.get(pk=titles[0]['id']).reviews_count == 1
@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return response.json(), len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18AuthorQueries:
+
+    def create_reviews(self, django_user_model, title, start, stop):
+        from reviews.models import Comment, Review
+
+        for idx in range(start, stop):
+            author = django_user_model.objects.create_user(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            review = Review.objects.create(
+                title=title, author=author, text=f'{idx}', score=5
+            )
+            Comment.objects.create(
+                review=Review.objects.earliest('pk'), author=author,
+                text=f'{idx}'
+            )
+        return review
+
+    @pytest.mark.parametrize('url', (
+        '/api/v1/titles/{title}/reviews/',
+        '/api/v1/titles/{title}/reviews/?cursor=',
+        '/api/v1/titles/{title}/reviews/{review}/comments/',
+        '/api/v1/titles/{title}/reviews/{review}/comments/?cursor=',
+    ))
+    def test_01_constant_queries_per_page(self, client, django_user_model,
+                                          url):
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Фильм', year=2000, description='')
+        self.create_reviews(django_user_model, title, 0, 2)
+        url = url.format(
+            title=title.pk, review=Review.objects.earliest('pk').pk
+        )
+        data, small_page = count_queries(client, url)
+        assert len(data['results']) == 2
+
+        self.create_reviews(django_user_model, title, 2, 10)
+        data, full_page = count_queries(client, url)
+        assert len(data['results']) == 10
+        assert data['results'][0]['author'].startswith('author')
+        assert full_page == small_page, (
+            f'Проверьте, что количество запросов к базе данных для `{url}` '
+            'не зависит от числа авторов на странице.'
+        )
+
+    def test_02_detail_author(self, client, django_user_model):
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Фильм', year=2000, description='')
+        review = self.create_reviews(django_user_model, title, 0, 1)
+        data, queries = count_queries(
+            client, f'/api/v1/titles/{title.pk}/reviews/{review.pk}/'
+        )
+        assert data['author'] == 'author0'
+        # Произведение и отзыв вместе с автором.
+        assert queries == 2
@@ -0,0 +1,57 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19CommentReviewFormat:
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return response.json(), [
+            query['sql'] for query in context.captured_queries
+        ]
+
+    def test_01_review_formats(self, client, admin):
+        from reviews.models import Comment, Review, Title
+
+        title = Title.objects.create(name='Фильм', year=2000, description='')
+        text = 'Очень длинный отзыв. ' * 50
+        review = Review.objects.create(
+            title=title, author=admin, text=text, score=5
+        )
+        for idx in range(3):
+            Comment.objects.create(review=review, author=admin, text=f'{idx}')
+        url = f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/'
+
+        data, _ = self.get(client, url)
+        assert data['results'][0]['review'] == text, (
+            'Проверьте, что по умолчанию поле `review` комментария содержит '
+            'текст отзыва.'
+        )
+
+        data, queries = self.get(client, f'{url}?review_format=id')
+        assert [
+            comment['review'] for comment in data['results']
+        ] == [review.pk] * 3, (
+            'Проверьте, что `?review_format=id` возвращает id отзыва.'
+        )
+        assert not any(
+            '"reviews_review"."text"' in sql for sql in queries
+        ), 'Проверьте, что `?review_format=id` не загружает текст отзыва.'
+
+        data, preview_queries = self.get(client, f'{url}?review_format=preview')
+        preview = data['results'][0]['review']
+        assert text.startswith(preview[:-1]) and len(preview) == 100, (
+            'Проверьте, что `?review_format=preview` возвращает начало '
+            'текста отзыва.'
+        )
+        assert len(preview_queries) == len(queries)
+
+        comment_id = data['results'][0]['id']
+        data, _ = self.get(client, f'{url}{comment_id}/?review_format=id')
+        assert data['review'] == review.pk
@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_comment, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20CommentCounters:
+
+    def get_reviews(self, client, title_id, query=''):
+        response = client.get(f'/api/v1/titles/{title_id}/reviews/{query}')
+        assert response.status_code == HTTPStatus.OK
+        return {
+            review['id']: review for review in response.json()['results']
+        }, [review['id'] for review in response.json()['results']]
+
+    def test_01_counters_follow_comments(self, client, admin_client,
+                                         user_client, moderator_client):
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Фильм', year=2000, description='')
+        first = create_single_review(user_client, title.pk, 'Раз', 5).json()
+        second = create_single_review(
+            moderator_client, title.pk, 'Два', 5
+        ).json()
+        assert first['comments_count'] == 0
+        assert first['last_comment_date'] is None
+
+        comments = [
+            create_single_comment(
+                admin_client, title.pk, first['id'], f'{idx}'
+            ).json()
+            for idx in range(3)
+        ]
+        create_single_comment(admin_client, title.pk, second['id'], 'Да')
+        reviews, _ = self.get_reviews(client, title.pk)
+        assert reviews[first['id']]['comments_count'] == 3, (
+            'Проверьте, что `comments_count` отзыва растёт при добавлении '
+            'комментариев.'
+        )
+        assert (
+            reviews[first['id']]['last_comment_date']
+            == comments[-1]['pub_date']
+        ), (
+            'Проверьте, что `last_comment_date` содержит дату последнего '
+            'комментария.'
+        )
+
+        _, order = self.get_reviews(client, title.pk, '?ordering=-comments_count')
+        assert order == [first['id'], second['id']]
+        _, order = self.get_reviews(client, title.pk, '?ordering=comments_count')
+        assert order == [second['id'], first['id']], (
+            'Проверьте, что отзывы сортируются по `?ordering=comments_count`.'
+        )
+
+        url = f'/api/v1/titles/{title.pk}/reviews/{first["id"]}/comments/'
+        admin_client.delete(f'{url}{comments[-1]["id"]}/')
+        reviews, _ = self.get_reviews(client, title.pk)
+        assert reviews[first['id']]['comments_count'] == 2
+        assert (
+            reviews[first['id']]['last_comment_date']
+            == comments[-2]['pub_date']
+        ), (
+            'Проверьте, что после удаления комментария `last_comment_date` '
+            'указывает на последний оставшийся.'
+        )
+
+    def test_02_recompute_command(self, client, admin, user_client):
+        from reviews.models import Comment, Review, Title
+
+        title = Title.objects.create(name='Фильм', year=2000, description='')
+        review = create_single_review(user_client, title.pk, 'Раз', 5).json()
+        Comment.objects.bulk_create(
+            Comment(review_id=review['id'], author=admin, text=f'{idx}')
+            for idx in range(4)
+        )
+        call_command('recompute_comment_counters', chunk_size=1)
+        reviews, _ = self.get_reviews(client, title.pk)
+        assert reviews[review['id']]['comments_count'] == 4, (
+            'Проверьте, что команда `recompute_comment_counters` '
+            'восстанавливает счётчики комментариев.'
+        )
+        assert Review.objects.get().last_comment_date is not None
@@ -0,0 +1,94 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+URL = '/api/v1/reviews/bulk/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21BulkReviews:
+
+    def test_01_bulk_results(self, client, admin_client, user_client, admin,
+                             user, moderator):
+        from reviews.models import Review, Title
+
+        first = Title.objects.create(name='Раз', year=2000, description='')
+        second = Title.objects.create(name='Два', year=2000, description='')
+        Review.objects.create(title=first, author=moderator, text='-', score=1)
+        data = [
+            {'title': first.pk, 'author': user.username, 'text': 'a',
+             'score': 9},
+            {'title': second.pk, 'author': user.username, 'text': 'b',
+             'score': 4},
+            {'title': second.pk, 'author': admin.username, 'text': 'c',
+             'score': 6},
+            {'title': first.pk, 'author': moderator.username, 'text': 'd',
+             'score': 5},
+            {'title': second.pk, 'author': user.username, 'text': 'e',
+             'score': 5},
+            {'title': 999, 'author': admin.username, 'text': 'f', 'score': 5},
+            {'title': first.pk, 'author': 'nobody', 'text': 'g', 'score': 5},
+            {'title': first.pk, 'author': admin.username, 'text': 'h',
+             'score': 11},
+        ]
+        assert user_client.post(URL, data=data, format='json').status_code == (
+            HTTPStatus.FORBIDDEN
+        ), 'Проверьте, что пакетная загрузка отзывов доступна только админу.'
+
+        response = admin_client.post(URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert [result['status'] for result in results] == (
+            ['created'] * 3 + ['error'] * 5
+        ), (
+            'Проверьте, что пакетная загрузка возвращает результат для '
+            'каждого отзыва.'
+        )
+        assert set(results[5]['errors']) == {'title'}
+        assert set(results[6]['errors']) == {'author'}
+        assert set(results[7]['errors']) == {'score'}
+        assert Review.objects.get(pk=results[0]['id']).text == 'a'
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert (first.rating, second.rating) == (5, 5), (
+            'Проверьте, что пакетная загрузка обновляет рейтинг произведений.'
+        )
+        response = client.get(f'/api/v1/titles/{second.pk}/')
+        assert response.json()['rating'] == 5
+
+    def test_02_constant_queries(self, admin_client, django_user_model):
+        from reviews.models import Title
+
+        titles = [
+            Title.objects.create(name=f'{idx}', year=2000, description='')
+            for idx in range(10)
+        ]
+        users = [
+            django_user_model.objects.create_user(
+                username=f'partner{idx}', email=f'partner{idx}@yamdb.fake'
+            )
+            for idx in range(20)
+        ]
+        data = [
+            {'title': title.pk, 'author': author.username, 'text': '-',
+             'score': 7}
+            for title in titles for author in users
+        ]
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.OK
+        assert all(
+            result['status'] == 'created'
+            for result in response.json()['results']
+        )
+        assert len(context.captured_queries) <= 12, (
+            'Проверьте, что число запросов пакетной загрузки не зависит от '
+            'количества отзывов.'
+        )
+
+    def test_03_not_a_list(self, admin_client):
+        response = admin_client.post(URL, data={'title': 1}, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
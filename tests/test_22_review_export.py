@@ -0,0 +1,50 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22ReviewExport:
+
+    def test_01_export_ndjson(self, client, admin_client, admin, user_client,
+                              user, moderator_client):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/export/'
+
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что выгрузка отзывов недоступна обычному '
+            'пользователю.'
+        )
+
+        response = moderator_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            'Проверьте, что выгрузка отзывов отдаётся потоком.'
+        )
+        assert response['Content-Type'] == 'application/x-ndjson'
+        rows = [
+            json.loads(line)
+            for line in b''.join(response.streaming_content).splitlines()
+        ]
+        exported_reviews = [row for row in rows if row['type'] == 'review']
+        exported_comments = [row for row in rows if row['type'] == 'comment']
+        assert {row['id'] for row in exported_reviews} == {
+            review['id'] for review in reviews
+        }, 'Проверьте, что выгрузка содержит все отзывы произведения.'
+        assert {row['id'] for row in exported_comments} == {
+            comment['id'] for comment in comments
+        }, 'Проверьте, что выгрузка содержит все комментарии к отзывам.'
+        assert exported_reviews[0]['author'] == reviews[0]['author']
+        assert exported_comments[0]['review_id'] == reviews[0]['id']
+
+        response = admin_client.get(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/export/'
+        )
+        assert b''.join(response.streaming_content) == b''
+        response = admin_client.get('/api/v1/titles/999/reviews/export/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+LIST_TABLES = ('"reviews_review"', '"reviews_comment"')
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def list_query_plans(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        f'Проверьте, что GET-запрос к `{url}` возвращает ответ со статусом '
+        '200.'
+    )
+    return {
+        query['sql']: explain(query['sql'])
+        for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+        and 'ORDER BY' in query['sql']
+        and any(f'FROM {table}' in query['sql'] for table in LIST_TABLES)
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23QueryPlans:
+
+    @pytest.mark.parametrize('query', (
+        '', '?ordering=score', '?ordering=-score', '?ordering=pub_date',
+        '?ordering=-pub_date', '?cursor=',
+    ))
+    def test_01_review_list_plans(self, client, admin, query):
+        from reviews.models import Comment, Review, Title
+
+        title = Title.objects.create(name='Фильм', year=2000, description='')
+        review = Review.objects.create(
+            title=title, author=admin, text='Да', score=5
+        )
+        Comment.objects.create(review=review, author=admin, text='Нет')
+
+        for url in (
+            f'/api/v1/titles/{title.pk}/reviews/{query}',
+            f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/'
+            f'{query if query == "?cursor=" else ""}',
+        ):
+            plans = list_query_plans(client, url)
+            assert plans, f'Не найден запрос списка для `{url}`.'
+            for sql, plan in plans.items():
+                assert not any('TEMP B-TREE' in step for step in plan), (
+                    f'Проверьте, что список `{url}` сортируется по индексу, '
+                    f'а не во временном B-дереве: {plan}'
+                )
+                assert not any(
+                    step.startswith('SCAN') for step in plan
+                ), (
+                    f'Проверьте, что список `{url}` не просматривает '
+                    f'таблицу целиком: {plan}'
+                )
+
+    def test_02_ordering_by_score(self, client, admin, user, moderator):
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Фильм', year=2000, description='')
+        for author, score in ((admin, 3), (user, 9), (moderator, 5)):
+            Review.objects.create(
+                title=title, author=author, text='-', score=score
+            )
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        response = client.get(f'{url}?ordering=-score')
+        assert [
+            review['score'] for review in response.json()['results']
+        ] == [9, 5, 3], (
+            'Проверьте, что отзывы сортируются по `?ordering=-score`.'
+        )
+        response = client.get(f'{url}?ordering=score')
+        assert [
+            review['score'] for review in response.json()['results']
+        ] == [3, 5, 9]
@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+URL_SIGNUP = '/api/v1/auth/signup/'
+
+
+def post(client, data):
+    with CaptureQueriesContext(connection) as context:
+        response = client.post(URL_SIGNUP, data=data)
+    return response, [
+        query['sql'] for query in context.captured_queries
+        if '"users_user"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24SignupQueries:
+
+    def test_01_new_user_single_insert(self, client, django_user_model):
+        data = {'email': 'new@yamdb.fake', 'username': 'new_user'}
+        response, queries = post(client, data)
+        assert response.status_code == HTTPStatus.OK
+        assert len(queries) == 1 and queries[0].startswith('INSERT'), (
+            f'Проверьте, что регистрация через `{URL_SIGNUP}` выполняет '
+            f'только вставку пользователя: {queries}'
+        )
+        assert django_user_model.objects.filter(**data).exists()
+
+    def test_02_existing_user_gets_new_code(self, client):
+        data = {'email': 'again@yamdb.fake', 'username': 'again'}
+        client.post(URL_SIGNUP, data=data)
+        outbox_count = len(mail.outbox)
+        response, queries = post(client, data)
+        assert response.status_code == HTTPStatus.OK
+        assert len(queries) <= 2, (
+            f'Проверьте, что повторная регистрация через `{URL_SIGNUP}` '
+            'стоит не больше одной вставки и одного поиска.'
+        )
+        assert len(mail.outbox) == outbox_count + 1, (
+            'Проверьте, что зарегистрированный пользователь получает новый '
+            'код подтверждения.'
+        )
+
+    @pytest.mark.parametrize('data,field', (
+        ({'email': 'other@yamdb.fake', 'username': 'taken'}, 'username'),
+        ({'email': 'taken@yamdb.fake', 'username': 'other'}, 'email'),
+    ))
+    def test_03_conflict_errors(self, client, data, field):
+        client.post(
+            URL_SIGNUP, data={'email': 'taken@yamdb.fake', 'username': 'taken'}
+        )
+        response, queries = post(client, data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert field in response.json(), (
+            f'Проверьте, что при занятом `{field}` ответ содержит ошибку '
+            'этого поля.'
+        )
+        assert len(queries) <= 2
+
+
+@pytest.mark.django_db
+class Test24SignupInsideAtomic:
+
+    def test_01_repeat_signup(self, client):
+        data = {'email': 'atomic@yamdb.fake', 'username': 'atomic'}
+        client.post(URL_SIGNUP, data=data)
+        response = client.post(URL_SIGNUP, data=data)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что повторная регистрация через `{URL_SIGNUP}` '
+            'работает внутри внешней транзакции: вставка пользователя '
+            'должна выполняться в `transaction.atomic()`.'
+        )
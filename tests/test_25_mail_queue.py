@@ -0,0 +1,96 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+URL_SIGNUP = '/api/v1/auth/signup/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25MailQueue:
+
+    @pytest.fixture(autouse=True)
+    def deferred_mail_queue(self, settings):
+        settings.MAIL_QUEUE_EAGER = False
+
+    def signup(self, client, number):
+        response = client.post(URL_SIGNUP, data={
+            'email': f'user{number}@yamdb.fake', 'username': f'user{number}'
+        })
+        assert response.status_code == HTTPStatus.OK
+
+    def test_01_signup_enqueues(self, client):
+        from users.models import OutgoingMail
+
+        self.signup(client, 1)
+        assert len(mail.outbox) == 0, (
+            f'Проверьте, что `{URL_SIGNUP}` не отправляет письмо на пути '
+            'запроса, а ставит его в очередь.'
+        )
+        assert OutgoingMail.objects.filter(
+            recipient='user1@yamdb.fake'
+        ).exists()
+
+    def test_02_process_queue_in_batches(self, client, settings):
+        from users.mail import get_mail_stats
+        from users.models import OutgoingMail
+
+        for number in range(5):
+            self.signup(client, number)
+        call_command('process_mail_queue', '--batch-size', '2')
+        assert sorted(message.to[0] for message in mail.outbox) == [
+            f'user{number}@yamdb.fake' for number in range(5)
+        ], 'Проверьте, что `process_mail_queue` отправляет все письма.'
+        assert not OutgoingMail.objects.exists(), (
+            'Проверьте, что доставленные письма удаляются из очереди.'
+        )
+        assert get_mail_stats()['sent'] == 5
+
+    def test_03_retry_with_backoff(self, client, settings):
+        from users.mail import get_mail_stats, process_mail_queue
+        from users.models import OutgoingMail
+
+        self.signup(client, 1)
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+        settings.EMAIL_HOST = '127.0.0.1'
+        settings.EMAIL_PORT = 1
+        settings.EMAIL_TIMEOUT = 1
+        assert process_mail_queue() == 0
+        queued = OutgoingMail.objects.get()
+        assert queued.attempts == 1 and queued.last_error, (
+            'Проверьте, что неудачная отправка записывает попытку и ошибку.'
+        )
+        delay = queued.next_attempt - timezone.now()
+        assert timedelta(0) < delay <= timedelta(
+            seconds=settings.MAIL_QUEUE_RETRY_DELAY
+        )
+        assert process_mail_queue() == 0 and (
+            OutgoingMail.objects.get().attempts == 1
+        ), 'Проверьте, что письмо не отправляется до истечения задержки.'
+        assert get_mail_stats()['failed'] == 1
+
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        OutgoingMail.objects.update(next_attempt=timezone.now())
+        assert process_mail_queue() == 1
+        assert len(mail.outbox) == 1
+
+    def test_04_drop_after_max_attempts(self, client, settings):
+        from users.mail import get_mail_stats, process_mail_queue
+        from users.models import OutgoingMail
+
+        self.signup(client, 1)
+        settings.MAIL_QUEUE_MAX_ATTEMPTS = 1
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+        settings.EMAIL_HOST = '127.0.0.1'
+        settings.EMAIL_PORT = 1
+        settings.EMAIL_TIMEOUT = 1
+        process_mail_queue()
+        OutgoingMail.objects.update(next_attempt=timezone.now())
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        assert process_mail_queue() == 0, (
+            'Проверьте, что письмо не отправляется после исчерпания попыток.'
+        )
+        assert get_mail_stats()['dropped'] == 1
@@ -0,0 +1,119 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+def get_client(user):
+    from api.views import get_tokens_for_user
+
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {get_tokens_for_user(user)["access"]}'
+    )
+    return client
+
+
+def user_queries(client, method, url, data=None):
+    with CaptureQueriesContext(connection) as context:
+        response = getattr(client, method)(url, data=data)
+    return response, [
+        query['sql'] for query in context.captured_queries
+        if 'FROM "users_user"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26ClaimsAuth:
+    url_categories = '/api/v1/categories/'
+
+    def test_01_no_user_lookup(self, admin):
+        client = get_client(admin)
+        response, queries = user_queries(
+            client, 'post', self.url_categories,
+            {'name': 'Фильмы', 'slug': 'films'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(queries) == 1 and '"password"' not in queries[0], (
+            'Проверьте, что аутентификация по JWT с ролью в утверждениях '
+            'не загружает пользователя из базы, а только сверяет версию '
+            f'прав: {queries}'
+        )
+        response, queries = user_queries(
+            client, 'get', f'{self.url_categories}?search=Фильмы'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert not queries, (
+            'Проверьте, что для безопасных запросов версия прав берётся '
+            f'из кэша: {queries}'
+        )
+
+    def test_02_review_author_from_claims(self, admin, user):
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Фильм', year=2000, description='')
+        response, queries = user_queries(
+            get_client(user), 'post', f'/api/v1/titles/{title.pk}/reviews/',
+            {'text': 'Да', 'score': 5}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+        assert len(queries) == 1 and '"password"' not in queries[0]
+
+    def test_03_role_change_takes_effect(self, admin):
+        client = get_client(admin)
+        admin.role = 'user'
+        admin.save()
+        response, queries = user_queries(
+            client, 'post', self.url_categories,
+            {'name': 'Фильмы', 'slug': 'films'}
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что после смены роли токен со старой ролью не даёт '
+            'прав администратора.'
+        )
+        assert queries, (
+            'Проверьте, что при устаревших утверждениях пользователь '
+            'загружается из базы.'
+        )
+
+    def test_04_cache_miss_falls_back(self, admin):
+        client = get_client(admin)
+        cache.clear()
+        response, queries = user_queries(
+            client, 'post', self.url_categories,
+            {'name': 'Фильмы', 'slug': 'films'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(queries) == 1, (
+            'Проверьте, что при промахе кэша версия прав читается из базы '
+            'одним запросом.'
+        )
+        response, queries = user_queries(client, 'get', '/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['bio'] == admin.bio
+
+    def test_05_deactivated_user_rejected(self, admin):
+        client = get_client(admin)
+        admin.is_active = False
+        admin.save()
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токен деактивированного пользователя '
+            'отклоняется.'
+        )
+
+    def test_06_role_change_bypassing_signals(self, admin, django_user_model):
+        client = get_client(admin)
+        client.get('/api/v1/users/me/')
+        django_user_model.objects.filter(pk=admin.pk).update(role='user')
+        response = client.post(
+            self.url_categories, data={'name': 'Фильмы', 'slug': 'films'}
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что изменяющие запросы сверяют версию прав с базой, '
+            'а не с кэшем: роль могла измениться в обход сигналов.'
+        )
@@ -0,0 +1,66 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+
+def check(permission, user, obj, method='patch'):
+    request = getattr(APIRequestFactory(), method)('/')
+    request.user = user
+    with CaptureQueriesContext(connection) as context:
+        allowed = permission.has_object_permission(request, None, obj)
+    return allowed, context.captured_queries
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27PermissionQueries:
+
+    @pytest.fixture
+    def review(self, user):
+        from reviews.models import Comment, Review, Title
+
+        title = Title.objects.create(name='Фильм', year=2000, description='')
+        review = Review.objects.create(
+            title=title, author=user, text='Да', score=5
+        )
+        Comment.objects.create(review=review, author=user, text='Нет')
+        return review
+
+    @pytest.mark.parametrize('role,allowed', (
+        ('user', True), ('moderator', True), ('admin', True), ('other', False)
+    ))
+    def test_01_review_permission(self, review, user, moderator, admin,
+                                  django_user_model, role, allowed):
+        from api.permissions import ReviewPermission
+        from reviews.models import Comment, Review
+
+        actor = {
+            'user': user, 'moderator': moderator, 'admin': admin,
+            'other': django_user_model.objects.create_user(
+                username='other', email='other@yamdb.fake'
+            ),
+        }[role]
+        for obj in (
+            Review.objects.get(pk=review.pk), Comment.objects.get()
+        ):
+            result, queries = check(ReviewPermission(), actor, obj)
+            assert result is allowed, (
+                f'Проверьте права роли `{role}` на изменение '
+                f'`{type(obj).__name__}`.'
+            )
+            assert not queries, (
+                'Проверьте, что проверка прав на объект не выполняет '
+                f'запросов к базе: {queries}'
+            )
+
+    def test_02_self_edit_permission(self, user, admin, django_user_model):
+        from api.permissions import SelfEditUserOnlyPermission
+
+        obj = django_user_model.objects.get(pk=user.pk)
+        allowed, queries = check(SelfEditUserOnlyPermission(), user, obj)
+        assert allowed and not queries, (
+            'Проверьте, что пользователь может изменять свою учётную запись '
+            'без запросов к базе.'
+        )
+        allowed, _ = check(SelfEditUserOnlyPermission(), admin, obj)
+        assert not allowed
@@ -0,0 +1,220 @@
+import csv
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import CommandError, call_command
+
+DATA_DIR = Path(__file__).resolve().parent.parent / 'api_yamdb/static/data'
+
+
+def count_rows(filename):
+    with open(DATA_DIR / filename, encoding='utf-8', newline='') as csv_file:
+        return sum(1 for _ in csv.DictReader(csv_file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28LoadCatalog:
+
+    def test_01_load_all_tables(self, tmp_path):
+        from reviews.models import Comment, Genre, Review, Title
+        from users.models import User
+
+        out = StringIO()
+        call_command(
+            'load_catalog', '--batch-size', '7', '--checkpoint-dir',
+            str(tmp_path), stdout=out
+        )
+        for model, filename in (
+            (User, 'users.csv'), (Genre, 'genre.csv'), (Title, 'titles.csv'),
+            (Title.genre.through, 'genre_title.csv'),
+            (Review, 'review.csv'), (Comment, 'comments.csv'),
+        ):
+            assert model.objects.count() == count_rows(filename), (
+                f'Проверьте, что `load_catalog` загружает все строки '
+                f'`{filename}`.'
+            )
+        assert 'строк/с' in out.getvalue(), (
+            'Проверьте, что `load_catalog` выводит скорость загрузки.'
+        )
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.isoformat().startswith('2019-09-24T21:08:21'), (
+            'Проверьте, что даты отзывов берутся из CSV.'
+        )
+        title = Title.objects.get(pk=review.title_id)
+        assert title.reviews_count == title.reviews.count(), (
+            'Проверьте, что после загрузки пересчитываются рейтинги.'
+        )
+        assert not User.objects.get(pk=100).has_usable_password()
+
+    def test_02_invalid_row(self, tmp_path):
+        (tmp_path / 'category.csv').write_text(
+            'id,name,slug\n1,Фильм,movie\nx,Книга,book\n', encoding='utf-8'
+        )
+        with pytest.raises(CommandError, match='category.csv, запись до 50 байта'):
+            call_command(
+                'load_catalog', '--path', str(tmp_path),
+                '--tables', 'category', stdout=StringIO(), stderr=StringIO()
+            )
+
+    def write_reviews(self, path, bad_id=None):
+        with open(path, 'w', encoding='utf-8', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(
+                ('id', 'title_id', 'text', 'author', 'score', 'pub_date')
+            )
+            for number in range(64):
+                review_id = number + 1
+                writer.writerow((
+                    review_id, number // 2 + 1, f'Отзыв\n№{review_id}',
+                    100 + number % 2, 'x' if review_id == bad_id else 5,
+                    '2020-01-13T23:20:02.422Z'
+                ))
+
+    def test_03_resume_from_checkpoint(self, tmp_path):
+        from api.loader import Checkpoint, parse_records, read_chunks
+        from reviews.models import Review
+
+        call_command(
+            'load_catalog', '--path', str(DATA_DIR), '--checkpoint-dir',
+            str(tmp_path), '--tables', 'users', 'category', 'titles',
+            stdout=StringIO()
+        )
+        path = tmp_path / 'review.csv'
+        self.write_reviews(path, bad_id=25)
+        with pytest.raises(CommandError):
+            call_command(
+                'load_catalog', '--path', str(tmp_path), '--tables', 'review',
+                '--batch-size', '10', stdout=StringIO()
+            )
+        assert Review.objects.count() == 20, (
+            'Проверьте, что зафиксированные пачки остаются после ошибки.'
+        )
+        checkpoint = Checkpoint(tmp_path / 'review.csv.checkpoint.json')
+        state = checkpoint.load()
+        assert state['last_id'] == 20 and state['rows'] == 20, (
+            'Проверьте, что контрольная точка хранит последний '
+            'зафиксированный id.'
+        )
+        # Пачка зафиксирована, а контрольная точка не успела записаться.
+        _, position, lines = next(read_chunks(path, size=10))
+        state.update(
+            rows=10, last_id=10,
+            offset=list(parse_records(lines, position))[-1][1]
+        )
+        checkpoint.save(**state)
+
+        self.write_reviews(path)
+        out = StringIO()
+        call_command(
+            'load_catalog', '--path', str(tmp_path), '--tables', 'review',
+            '--batch-size', '10', '--resume', '--progress-interval', '0',
+            stdout=out
+        )
+        assert sorted(
+            Review.objects.values_list('pk', flat=True)
+        ) == list(range(1, 65)), (
+            'Проверьте, что `--resume` продолжает загрузку с контрольной '
+            'точки без повторов.'
+        )
+        assert Review.objects.get(pk=64).text == 'Отзыв\n№64'
+        assert '% файла' in out.getvalue(), (
+            'Проверьте, что во время загрузки выводится прогресс.'
+        )
+        assert checkpoint.load() is None, (
+            'Проверьте, что после загрузки контрольные точки удаляются.'
+        )
+
+    def test_04_changed_file_not_resumed(self, tmp_path):
+        from api.loader import Checkpoint
+
+        path = tmp_path / 'category.csv'
+        path.write_text('id,name,slug\n1,Фильм,movie\n', encoding='utf-8')
+        Checkpoint(tmp_path / 'category.csv.checkpoint.json').save(
+            size=1, offset=0, last_id=None, rows=0, done=False
+        )
+        with pytest.raises(CommandError, match='изменился'):
+            call_command(
+                'load_catalog', '--path', str(tmp_path), '--tables',
+                'category', '--resume', stdout=StringIO()
+            )
+
+    def test_05_parallel_parsing(self, tmp_path):
+        from reviews.models import Review
+
+        call_command(
+            'load_catalog', '--path', str(DATA_DIR), '--checkpoint-dir',
+            str(tmp_path), '--tables', 'users', 'category', 'titles',
+            stdout=StringIO()
+        )
+        path = tmp_path / 'review.csv'
+        self.write_reviews(path)
+        call_command(
+            'load_catalog', '--path', str(tmp_path), '--tables', 'review',
+            '--batch-size', '6', '--workers', '2', stdout=StringIO()
+        )
+        assert sorted(
+            Review.objects.values_list('pk', flat=True)
+        ) == list(range(1, 65)), (
+            'Проверьте, что `--workers` загружает все записи.'
+        )
+        assert Review.objects.get(pk=7).text == 'Отзыв\n№7', (
+            'Проверьте, что записи с переводами строк не разрываются '
+            'между пачками.'
+        )
+
+    def test_06_score_out_of_range(self, tmp_path):
+        path = tmp_path / 'review.csv'
+        self.write_reviews(path)
+        path.write_text(
+            path.read_text(encoding='utf-8').replace(',5,', ',11,', 1),
+            encoding='utf-8'
+        )
+        with pytest.raises(CommandError, match='1..10'):
+            call_command(
+                'load_catalog', '--path', str(tmp_path), '--tables', 'review',
+                '--workers', '2', stdout=StringIO()
+            )
+
+    def get_sqlite_state(self):
+        from django.db import connection
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' "
+                "ORDER BY name"
+            )
+            indexes = [row[0] for row in cursor.fetchall()]
+            pragmas = []
+            for name in ('journal_mode', 'synchronous', 'cache_size'):
+                cursor.execute(f'PRAGMA {name}')
+                pragmas.append(cursor.fetchone()[0])
+        return indexes, pragmas
+
+    def test_07_fast_mode_restores_settings(self, tmp_path):
+        from reviews.models import Review
+
+        before = self.get_sqlite_state()
+        call_command(
+            'load_catalog', '--fast', '--checkpoint-dir', str(tmp_path),
+            stdout=StringIO()
+        )
+        assert Review.objects.count() == count_rows('review.csv')
+        assert self.get_sqlite_state() == before, (
+            'Проверьте, что `--fast` восстанавливает индексы и настройки '
+            'SQLite после загрузки.'
+        )
+
+    def test_08_fast_mode_restores_after_error(self, tmp_path):
+        path = tmp_path / 'review.csv'
+        self.write_reviews(path, bad_id=3)
+        before = self.get_sqlite_state()
+        with pytest.raises(CommandError):
+            call_command(
+                'load_catalog', '--fast', '--path', str(tmp_path),
+                '--tables', 'review', stdout=StringIO()
+            )
+        assert self.get_sqlite_state() == before, (
+            'Проверьте, что `--fast` восстанавливает индексы и настройки '
+            'SQLite, даже если загрузка завершилась ошибкой.'
+        )
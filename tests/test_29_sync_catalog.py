@@ -0,0 +1,130 @@
+import shutil
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import CommandError, call_command
+
+DATA_DIR = Path(__file__).resolve().parent.parent / 'api_yamdb/static/data'
+
+
+def sync(path, *args):
+    out = StringIO()
+    call_command(
+        'load_catalog', '--sync', '--path', str(path), *args, stdout=out
+    )
+    return out.getvalue()
+
+
+def replace_in_file(path, old, new):
+    text = path.read_text(encoding='utf-8')
+    assert old in text
+    path.write_text(text.replace(old, new, 1), encoding='utf-8')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29SyncCatalog:
+
+    @pytest.fixture
+    def data_dir(self, tmp_path):
+        shutil.copytree(DATA_DIR, tmp_path / 'data')
+        return tmp_path / 'data'
+
+    def test_01_unchanged_rows_skipped(self, data_dir):
+        from reviews.models import Review
+
+        output = sync(data_dir)
+        assert 'review: добавлено 72, обновлено 0' in output, (
+            'Проверьте, что первая синхронизация добавляет все строки.'
+        )
+        assert Review.objects.count() == 72
+        output = sync(data_dir)
+        assert (
+            'review: добавлено 0, обновлено 0, без изменений 72' in output
+        ), (
+            'Проверьте, что повторная синхронизация пропускает строки без '
+            'изменений.'
+        )
+
+    def test_02_changed_rows_updated(self, data_dir):
+        from reviews.models import Review, Title
+        from reviews.search import search_titles
+        from users.models import User
+
+        sync(data_dir)
+        user = User.objects.get(pk=100)
+        user.set_password('1234567')
+        user.save()
+        replace_in_file(
+            data_dir / 'users.csv', 'bingobongo@yamdb.fake,user,,',
+            'bingobongo@yamdb.fake,user,Био,'
+        )
+        replace_in_file(
+            data_dir / 'titles.csv', 'Побег из Шоушенка', 'Шоушенк навсегда'
+        )
+        review = Review.objects.get(pk=1)
+        replace_in_file(
+            data_dir / 'review.csv', f',{review.author_id},10,',
+            f',{review.author_id},2,'
+        )
+        output = sync(data_dir, '--tables', 'users', 'titles', 'review')
+        assert 'titles: добавлено 0, обновлено 1' in output
+        assert 'review: добавлено 0, обновлено 1' in output, (
+            'Проверьте, что синхронизация обновляет только изменённые '
+            'строки.'
+        )
+        title = Title.objects.get(pk=1)
+        assert title.name == 'Шоушенк навсегда'
+        assert title.reviews_count and title.score_sum == sum(
+            title.reviews.values_list('score', flat=True)
+        ), 'Проверьте, что после синхронизации пересчитывается рейтинг.'
+        assert list(search_titles(Title.objects.all(), 'навсегда')) == [
+            title
+        ], 'Проверьте, что изменённое произведение переиндексируется.'
+        user.refresh_from_db()
+        assert user.bio == 'Био' and user.check_password('1234567'), (
+            'Проверьте, что синхронизация пользователей не сбрасывает '
+            'пароль.'
+        )
+
+    def test_03_existing_rows_adopted(self, data_dir):
+        from reviews.models import Review
+
+        call_command(
+            'load_catalog', '--path', str(data_dir), stdout=StringIO()
+        )
+        output = sync(data_dir)
+        assert 'review: добавлено 0, обновлено 72' in output, (
+            'Проверьте, что строки, загруженные без отпечатков, '
+            'обновляются, а не вставляются повторно.'
+        )
+        assert Review.objects.count() == 72
+
+    def test_04_delete_missing(self, data_dir):
+        from reviews.models import Comment, Review
+
+        sync(data_dir)
+        lines = (data_dir / 'comments.csv').read_text(
+            encoding='utf-8'
+        ).splitlines(keepends=True)
+        (data_dir / 'comments.csv').write_text(
+            ''.join(lines[:-1]), encoding='utf-8'
+        )
+        output = sync(data_dir, '--tables', 'comments')
+        assert Comment.objects.count() == 3, (
+            'Проверьте, что без `--delete-missing` строки не удаляются.'
+        )
+        assert 'удалено 0' in output
+        output = sync(data_dir, '--tables', 'comments', '--delete-missing')
+        assert 'удалено 1' in output
+        assert Comment.objects.count() == 2
+        review = Review.objects.get(pk=Comment.objects.first().review_id)
+        assert review.comments_count == review.comments.count(), (
+            'Проверьте, что после удаления пересчитываются счётчики '
+            'комментариев.'
+        )
+
+    @pytest.mark.parametrize('option', ('--fast', '--resume'))
+    def test_05_incompatible_options(self, data_dir, option):
+        with pytest.raises(CommandError):
+            sync(data_dir, option)